@@ -2,20 +2,26 @@
 GreenReader backend CLI.
 
 Usage:
-    python -m backend.cli build <course_name>          Build all holes
+    python -m backend.cli build <course_name> [-j N]   Build all holes (N parallel processes)
     python -m backend.cli build <course_name> <hole>   Build a single hole
+    python -m backend.cli build <course_name> --force  Rebuild holes that are up to date
     python -m backend.cli upload <course> --course-id <slug> [--api-url <url>] [--hole <Hole_X>]
 """
 
 import argparse
+import functools
 import json
 import os
+import shutil
 import sys
 import logging
-from urllib.parse import urlsplit, urlunsplit
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 import numpy as np
+import orjson
 import requests
+import shapely
+from requests.adapters import HTTPAdapter
 from shapely.geometry import Polygon
 
 from backend.maps import GreenExtentsLatLon, infer_green_size_ft
@@ -28,10 +34,25 @@ LOG_LEVEL = os.environ.get("GREENREADER_LOG_LEVEL", "INFO").upper()
 logging.basicConfig(level=LOG_LEVEL, format="%(levelname)s: %(message)s")
 logger = logging.getLogger("greenreader.cli")
 
+UPLOAD_WORKERS = 8
+
+_session: requests.Session | None = None
+
+
+def _get_session() -> requests.Session:
+    """Shared session so API calls and S3 uploads reuse pooled connections."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
 
 def _safe_url(url: str) -> str:
-    parts = urlsplit(url)
-    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+    # Drop query + fragment (presigned URLs carry credentials in the query)
+    return url.split("?", 1)[0].split("#", 1)[0]
 
 
 def _request(method: str, url: str, **kwargs) -> requests.Response:
@@ -39,7 +60,7 @@ def _request(method: str, url: str, **kwargs) -> requests.Response:
     logger.info("%s %s", method.upper(), safe_url)
     if "json" in kwargs and isinstance(kwargs["json"], dict):
         logger.debug("JSON keys: %s", list(kwargs["json"].keys()))
-    resp = requests.request(method, url, **kwargs)
+    resp = _get_session().request(method, url, **kwargs)
     logger.info("%s %s -> %s", method.upper(), safe_url, resp.status_code)
     if resp.status_code >= 400:
         body_preview = resp.text[:500]
@@ -47,10 +68,17 @@ def _request(method: str, url: str, **kwargs) -> requests.Response:
     return resp
 
 
+@functools.lru_cache(maxsize=64)
 def load_config(course_name: str, hole_name: str) -> dict:
-    cfg_file = paths.config_path(course_name, hole_name)
-    with open(cfg_file, "r") as f:
-        return json.load(f)
+    cfg_file = paths.hole_paths(course_name, hole_name).config
+    with open(cfg_file, "rb") as f:
+        return orjson.loads(f.read())
+
+
+@functools.lru_cache(maxsize=64)
+def load_boundary(course_name: str, hole_name: str) -> dict:
+    with open(paths.hole_paths(course_name, hole_name).boundary, "rb") as f:
+        return orjson.loads(f.read())
 
 
 def extents_from_config(cfg: dict) -> GreenExtentsLatLon:
@@ -63,18 +91,35 @@ def extents_from_config(cfg: dict) -> GreenExtentsLatLon:
     )
 
 
+def _scan_hole(course_name: str, hole_name: str) -> set[str]:
+    """
+    Paths of all files in the hole folder and its unity/ subfolder.
+    One scandir per folder; DirEntry.is_file() reuses the readdir data.
+    """
+    hp = paths.hole_paths(course_name, hole_name)
+    files = set()
+    for d in (hp.hole_dir, hp.unity_dir):
+        try:
+            with os.scandir(d) as it:
+                files.update(e.path for e in it if e.is_file())
+        except FileNotFoundError:
+            pass
+    return files
+
+
 def validate_hole(course_name: str, hole_name: str) -> list[str]:
     """Return list of missing files (empty = valid)."""
+    files = _scan_hole(course_name, hole_name)
+    hp = paths.hole_paths(course_name, hole_name)
     missing = []
     checks = [
-        ("config.json", paths.config_path),
-        ("contour PNG", paths.contour_path),
-        ("boundary JSON", paths.boundary_path),
-        ("contours JSON", paths.contours_path),
+        ("config.json", hp.config),
+        ("contour PNG", hp.contour),
+        ("boundary JSON", hp.boundary),
+        ("contours JSON", hp.contours),
     ]
-    for label, path_fn in checks:
-        p = path_fn(course_name, hole_name)
-        if not os.path.isfile(p):
+    for label, p in checks:
+        if p not in files:
             missing.append(f"{label} ({p})")
     return missing
 
@@ -84,13 +129,21 @@ def discover_holes(course_name: str) -> list[str]:
     cdir = paths.course_dir(course_name)
     if not os.path.isdir(cdir):
         return []
-    return sorted(
-        d for d in os.listdir(cdir)
-        if d.startswith("Hole_") and os.path.isdir(os.path.join(cdir, d))
-    )
+    with os.scandir(cdir) as it:
+        return sorted(e.name for e in it if e.name.startswith("Hole_") and e.is_dir())
 
 
-def build_hole(course_name: str, hole_name: str) -> bool:
+def _is_up_to_date(hp: paths.HolePaths) -> bool:
+    """True if both heightfield outputs are newer than every build input."""
+    try:
+        out_mtime = min(os.stat(p).st_mtime for p in (hp.heightfield_bin, hp.heightfield_json))
+    except FileNotFoundError:
+        return False
+    in_mtime = max(os.stat(p).st_mtime for p in (hp.config, hp.boundary, hp.contours, hp.contour))
+    return out_mtime >= in_mtime
+
+
+def build_hole(course_name: str, hole_name: str, force: bool = False) -> bool:
     """Build heightfield for a single hole. Returns True on success."""
     # 1. Validate
     missing = validate_hole(course_name, hole_name)
@@ -99,22 +152,35 @@ def build_hole(course_name: str, hole_name: str) -> bool:
             print(f"  MISSING: {m}")
         return False
 
-    # 2. Load config
-    cfg = load_config(course_name, hole_name)
-    extents = extents_from_config(cfg)
-    green_width_ft, green_height_ft = infer_green_size_ft(extents)
-
-    # 3. Load boundary
-    with open(paths.boundary_path(course_name, hole_name)) as f:
-        b = json.load(f)
-    boundary_poly = Polygon([(p["x"], p["z"]) for p in b["points_xz_ft"]])
+    if not force and _is_up_to_date(paths.hole_paths(course_name, hole_name)):
+        print(f"  UP-TO-DATE: {hole_name} (use --force to rebuild)")
+        return True
+
+    # 2. Load boundary
+    hp = paths.hole_paths(course_name, hole_name)
+    if force:
+        shutil.rmtree(hp.rbf_cache, ignore_errors=True)  # --force refits from scratch
+    b = load_boundary(course_name, hole_name)
+
+    # 3. Green size: trace_boundary stores it in the boundary JSON (same source
+    # the upload uses); fall back to the config extents for older files.
+    if "green_width_ft" in b and "green_height_ft" in b:
+        green_width_ft = float(b["green_width_ft"])
+        green_height_ft = float(b["green_height_ft"])
+    else:
+        extents = extents_from_config(load_config(course_name, hole_name))
+        green_width_ft, green_height_ft = infer_green_size_ft(extents)
+    ring = np.array([(p["x"], p["z"]) for p in b["points_xz_ft"]], dtype=np.float64)
+    boundary_poly = Polygon(ring)  # (N, 2) array goes straight to GEOS
+    shapely.prepare(boundary_poly)
 
     # 4. Load contours
-    with open(paths.contours_path(course_name, hole_name)) as f:
-        c = json.load(f)
+    with open(hp.contours, "rb") as f:
+        c = orjson.loads(f.read())
     contours_in = []
     for item in c["contours"]:
-        pts = [(p["x"], p["z"]) for p in item["points_xz_ft"]]
+        # (N, 2) float64 per contour; sample_polyline consumes it without conversion
+        pts = np.array([(p["x"], p["z"]) for p in item["points_xz_ft"]], dtype=np.float64)
         contours_in.append({"height_ft": float(item["height_ft"]), "points_xz": pts})
 
     # 5. Reconstruct heightfield
@@ -128,16 +194,19 @@ def build_hole(course_name: str, hole_name: str) -> bool:
         grid_z=Z,
         sample_step_ft=1.0,
         smooth=0.25,
+        dtype=np.float32,
+        cache_dir=hp.rbf_cache,
     )
 
-    Y_filled = np.nan_to_num(Y, nan=0.0).astype(np.float32)
+    # Unity reads raw row-major float32: guarantee C order (no copy when it already is)
+    Y_filled = np.ascontiguousarray(np.nan_to_num(Y, copy=False, nan=0.0), dtype=np.float32)
 
     # 6. Write outputs
-    out_dir = paths.unity_dir(course_name, hole_name)
+    out_dir = hp.unity_dir
     os.makedirs(out_dir, exist_ok=True)
 
-    bin_path = paths.heightfield_bin_path(course_name, hole_name)
-    meta_path = paths.heightfield_json_path(course_name, hole_name)
+    bin_path = hp.heightfield_bin
+    meta_path = hp.heightfield_json
 
     Y_filled.tofile(bin_path)
 
@@ -178,11 +247,22 @@ def cmd_build(args):
         print(f"No Hole_* folders found in {paths.course_dir(course_name)}")
         sys.exit(1)
 
-    results = {}
-    for hole_name in holes:
-        print(f"\n--- Building {course_name}/{hole_name} ---")
-        success = build_hole(course_name, hole_name)
-        results[hole_name] = success
+    jobs = args.jobs or os.cpu_count() or 1
+    results = {hole_name: False for hole_name in holes}  # keeps submission order
+
+    if jobs == 1 or len(holes) == 1:
+        for hole_name in holes:
+            print(f"\n--- Building {course_name}/{hole_name} ---")
+            results[hole_name] = build_hole(course_name, hole_name, args.force)
+    else:
+        # Holes are independent and CPU-bound: build them in separate processes
+        print(f"\nBuilding {len(holes)} holes with {min(jobs, len(holes))} workers")
+        with ProcessPoolExecutor(max_workers=min(jobs, len(holes))) as ex:
+            futures = {ex.submit(build_hole, course_name, h, args.force): h for h in holes}
+            for fut in as_completed(futures):
+                hole_name = futures[fut]
+                results[hole_name] = fut.result()
+                print(f"--- Finished {course_name}/{hole_name} ---", flush=True)
 
     # Summary
     print("\n=== Build Summary ===")
@@ -213,18 +293,20 @@ PROCESSED_FILES = {
 
 def _local_source_files(course_name: str, hole_name: str) -> dict[str, str | None]:
     """Map S3 file names → local paths (None if missing)."""
+    hp = paths.hole_paths(course_name, hole_name)
     return {
-        "contour.png": paths.contour_path(course_name, hole_name),
-        "map.png": paths.map_path(course_name, hole_name),
-        "boundary.json": paths.boundary_path(course_name, hole_name),
-        "contours.json": paths.contours_path(course_name, hole_name),
+        "contour.png": hp.contour,
+        "map.png": hp.map,
+        "boundary.json": hp.boundary,
+        "contours.json": hp.contours,
     }
 
 
 def _local_processed_files(course_name: str, hole_name: str) -> dict[str, str | None]:
+    hp = paths.hole_paths(course_name, hole_name)
     return {
-        "heightfield.json": paths.heightfield_json_path(course_name, hole_name),
-        "heightfield.bin": paths.heightfield_bin_path(course_name, hole_name),
+        "heightfield.json": hp.heightfield_json,
+        "heightfield.bin": hp.heightfield_bin,
     }
 
 
@@ -236,12 +318,15 @@ def _hole_num_from_name(hole_name: str) -> int:
 def upload_file(local_path: str, presigned_url: str, content_type: str):
     """Upload a file to S3 using a pre-signed URL."""
     print(f"    Uploading {os.path.basename(local_path)}...")
+    size = os.path.getsize(local_path)
     with open(local_path, "rb") as f:
+        # Stream from the file handle; an explicit Content-Length keeps the
+        # PUT un-chunked, which S3 presigned URLs require.
         resp = _request(
             "PUT",
             presigned_url,
             data=f,
-            headers={"Content-Type": content_type},
+            headers={"Content-Type": content_type, "Content-Length": str(size)},
         )
     resp.raise_for_status()
 
@@ -252,16 +337,17 @@ def upload_hole(api_url: str, course_id: str,
     hole_num = _hole_num_from_name(hole_name)
 
     # Check which local files exist
+    files = _scan_hole(course_name, hole_name)
     source_map = _local_source_files(course_name, hole_name)
     processed_map = _local_processed_files(course_name, hole_name)
 
     existing_source = {
         name: path for name, path in source_map.items()
-        if os.path.isfile(path)
+        if path in files
     }
     existing_processed = {
         name: path for name, path in processed_map.items()
-        if os.path.isfile(path)
+        if path in files
     }
 
     if not existing_source:
@@ -271,9 +357,8 @@ def upload_hole(api_url: str, course_id: str,
     # Read green dimensions from boundary JSON if available
     reg_body: dict = {}
     bnd_path = source_map["boundary.json"]
-    if os.path.isfile(bnd_path):
-        with open(bnd_path, "r") as f:
-            bnd = json.load(f)
+    if bnd_path in files:
+        bnd = load_boundary(course_name, hole_name)
         if "green_width_ft" in bnd:
             reg_body["greenWidthFt"] = bnd["green_width_ft"]
         if "green_height_ft" in bnd:
@@ -289,17 +374,21 @@ def upload_hole(api_url: str, course_id: str,
     resp.raise_for_status()
     urls = resp.json()["uploadUrls"]
 
-    # 2. Upload source files
-    has_source = False
-    for name, local_path in existing_source.items():
-        upload_file(local_path, urls["source"][name], SOURCE_FILES[name])
-        has_source = True
+    # 2-3. Upload source + processed files concurrently (I/O-bound)
+    uploads = [
+        (local_path, urls["source"][name], SOURCE_FILES[name])
+        for name, local_path in existing_source.items()
+    ] + [
+        (local_path, urls["processed"][name], PROCESSED_FILES[name])
+        for name, local_path in existing_processed.items()
+    ]
+    with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as ex:
+        futures = [ex.submit(upload_file, *u) for u in uploads]
+        for fut in as_completed(futures):
+            fut.result()  # re-raises HTTPError from upload_file
 
-    # 3. Upload processed files
-    has_processed = False
-    for name, local_path in existing_processed.items():
-        upload_file(local_path, urls["processed"][name], PROCESSED_FILES[name])
-        has_processed = True
+    has_source = bool(existing_source)
+    has_processed = bool(existing_processed)
 
     # 4. Update hole status flags
     update_body: dict = {}
@@ -400,6 +489,10 @@ def main():
     build_p.add_argument("course", help="Course name (e.g. PresidioGC)")
     build_p.add_argument("hole", nargs="?", default=None,
                          help="Optional hole name (e.g. Hole_1)")
+    build_p.add_argument("-j", "--jobs", type=int, default=None,
+                         help="Parallel build processes (default: CPU count)")
+    build_p.add_argument("--force", action="store_true",
+                         help="Rebuild even if outputs are newer than inputs")
     build_p.set_defaults(func=cmd_build)
 
     # upload subcommand
@@ -4,7 +4,7 @@ Mapping helpers: geodesic extents, pixel↔feet transforms, and outline extracti
 from .google_scale import GreenExtentsLatLon, geodesic_distance_ft, infer_green_size_ft
 from .green_map_scale import PixelToFeetTransform, make_local_grid_ft
 from .green_map_outline import extract_green_mask_from_boundary
-from .local_enu import ref_from_extents, latlon_to_xz_ft
+from .local_enu import ref_from_extents, latlon_to_xz_ft, latlon_to_xz_ft_bulk
 
 __all__ = [
     "GreenExtentsLatLon",
@@ -15,4 +15,5 @@ __all__ = [
     "extract_green_mask_from_boundary",
     "ref_from_extents",
     "latlon_to_xz_ft",
+    "latlon_to_xz_ft_bulk",
 ]
\ No newline at end of file
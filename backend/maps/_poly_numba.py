@@ -0,0 +1,52 @@
+"""
+Numba point-in-polygon for regular grids.
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, parallel=True)
+def grid_inside(vx, vy, x_coords, z_coords):
+    """
+    Even-odd (Franklin) ray-cast of every grid point against one polygon ring.
+
+    vx, vy: ring vertices (closed or open)
+    x_coords: (nx,) column coordinates, z_coords: (nz,) row coordinates
+    Returns uint8 mask of shape (nz, nx), 1 = inside.
+
+    Half-open rule: points exactly on a left or bottom edge count as inside,
+    unlike shapely's strict contains().
+    """
+    n_vert = vx.shape[0]
+    nx = x_coords.shape[0]
+    nz = z_coords.shape[0]
+    out = np.zeros((nz, nx), np.uint8)
+
+    for r in prange(nz):
+        y = z_coords[r]
+
+        # x positions where the horizontal line z=y crosses an edge
+        x_cross = np.empty(n_vert, np.float64)
+        n_cross = 0
+        j = n_vert - 1
+        for i in range(n_vert):
+            yi = vy[i]
+            yj = vy[j]
+            if (yi > y) != (yj > y):
+                x_cross[n_cross] = (vx[j] - vx[i]) * (y - yi) / (yj - yi) + vx[i]
+                n_cross += 1
+            j = i
+
+        if n_cross == 0:
+            continue
+
+        for c in range(nx):
+            x = x_coords[c]
+            inside = False
+            for k in range(n_cross):
+                if x < x_cross[k]:
+                    inside = not inside
+            if inside:
+                out[r, c] = 1
+
+    return out
@@ -3,6 +3,8 @@ from pyproj import Geod
 
 M_TO_FT = 3.280839895
 
+_GEOD = Geod(ellps="WGS84")
+
 @dataclass(frozen=True)
 class GreenExtentsLatLon:
     north: tuple[float, float]  # (lat, lon)
@@ -16,10 +18,9 @@ def geodesic_distance_ft(a: tuple[float, float], b: tuple[float, float]) -> floa
     a, b are (lat, lon).
     Returns feet.
     """
-    geod = Geod(ellps="WGS84")
     lat1, lon1 = a
     lat2, lon2 = b
-    _, _, dist_m = geod.inv(lon1, lat1, lon2, lat2)  # (az12, az21, dist_m)
+    _, _, dist_m = _GEOD.inv(lon1, lat1, lon2, lat2)  # (az12, az21, dist_m)
     return dist_m * M_TO_FT
 
 def infer_green_size_ft(extents: GreenExtentsLatLon) -> tuple[float, float]:
@@ -46,8 +46,11 @@ class PixelToFeetTransform:
 def make_local_grid_ft(green_width_ft: float, green_height_ft: float, resolution_ft: float):
     """
     Make an (X,Z) grid in feet centered at (0,0).
+
+    Returns sparse float32 grids: X has shape (1, nx), Z has shape (nz, 1).
+    They broadcast against each other to the full (nz, nx) grid.
     """
-    x = np.arange(-green_width_ft/2, green_width_ft/2 + resolution_ft, resolution_ft)
-    z = np.arange(-green_height_ft/2, green_height_ft/2 + resolution_ft, resolution_ft)
-    X, Z = np.meshgrid(x, z)
+    x = np.arange(-green_width_ft/2, green_width_ft/2 + resolution_ft, resolution_ft).astype(np.float32)
+    z = np.arange(-green_height_ft/2, green_height_ft/2 + resolution_ft, resolution_ft).astype(np.float32)
+    X, Z = np.meshgrid(x, z, sparse=True)
     return X, Z
\ No newline at end of file
@@ -1,9 +1,12 @@
 import math
 from dataclasses import dataclass
+import numpy as np
 from pyproj import Geod
 
 M_TO_FT = 3.280839895
 
+_GEOD = Geod(ellps="WGS84")
+
 @dataclass(frozen=True)
 class RefFrame:
     lat0: float
@@ -21,11 +24,25 @@ def latlon_to_xz_ft(ref: RefFrame, lat: float, lon: float) -> tuple[float, float
       x = east (+)
       z = north (+)
     """
-    geod = Geod(ellps="WGS84")
-    az12_deg, _, dist_m = geod.inv(ref.lon0, ref.lat0, lon, lat)
+    az12_deg, _, dist_m = _GEOD.inv(ref.lon0, ref.lat0, lon, lat)
     az = math.radians(az12_deg)
 
     east_m = dist_m * math.sin(az)
     north_m = dist_m * math.cos(az)
 
     return east_m * M_TO_FT, north_m * M_TO_FT
+
+def latlon_to_xz_ft_bulk(ref: RefFrame, lats, lons) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized latlon_to_xz_ft: one Geod.inv call for all points.
+    Returns (x_ft, z_ft) arrays.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    az12_deg, _, dist_m = _GEOD.inv(
+        np.full_like(lons, ref.lon0), np.full_like(lats, ref.lat0), lons, lats
+    )
+    az = np.radians(az12_deg)
+    dist_ft = np.asarray(dist_m) * M_TO_FT
+
+    return dist_ft * np.sin(az), dist_ft * np.cos(az)
@@ -0,0 +1,190 @@
+"""
+Numba kernels for the ball-roll integrators.
+
+Both simulators share one semi-implicit Euler loop. `stimp_mode` selects the
+rolling-resistance model:
+  - False: linear damping          a_resist = -k * v
+  - True:  constant deceleration   a_resist = -a0 * v_hat
+
+Terrain samples are bilinear inside the green; when any corner of the cell is
+outside the mask (or past the grid edge) the cell value is used instead. Both
+facts are packed per cell into one uint8 flag grid (see cell_flags), so each
+step costs a single lookup instead of re-checking the mask neighbours.
+"""
+import math
+
+import numpy as np
+from numba import njit, prange
+
+G_FTPS2 = 32.174  # gravity in ft/s^2
+
+# cell_flags bits
+INSIDE = 1    # cell is on the green
+BILINEAR = 2  # ... and so are its +x, +z and diagonal neighbours
+
+
+@njit(cache=True)
+def cell_flags(mask):
+    """Pack the green mask and the bilinear-stencil test into a (nz, nx) uint8 grid."""
+    nz, nx = mask.shape
+    flags = np.zeros((nz, nx), np.uint8)
+    for iz in range(nz):
+        for ix in range(nx):
+            if not mask[iz, ix]:
+                continue
+            f = INSIDE
+            if ix + 1 < nx and iz + 1 < nz and mask[iz, ix + 1] and mask[iz + 1, ix] and mask[iz + 1, ix + 1]:
+                f |= BILINEAR
+            flags[iz, ix] = f
+    return flags
+
+
+@njit(cache=True, fastmath=True)
+def _sample(A, bilinear, iz, ix, tz, tx):
+    if bilinear:
+        a0 = A[iz, ix] + (A[iz, ix + 1] - A[iz, ix]) * tx
+        a1 = A[iz + 1, ix] + (A[iz + 1, ix + 1] - A[iz + 1, ix]) * tx
+        return a0 + (a1 - a0) * tz
+    return A[iz, ix]
+
+
+@njit(cache=True, fastmath=True)
+def _cell(f, n):
+    # floor index + fraction, clamped to the grid
+    i = int(math.floor(f))
+    if i < 0:
+        return 0, 0.0
+    if i >= n - 1:
+        return n - 1, 0.0
+    return i, f - i
+
+
+@njit(cache=True, fastmath=True)
+def _integrate(Y, gx, gz, flags, x0, z0, res, px, pz, vx, vz, dt, k_or_a0, stimp_mode,
+               stop_speed, max_steps, cup_x, cup_z, cup_r2, max_cup_speed,
+               path_x, path_z, path_y):
+    """
+    Roll one ball. Positions are written to path_* when they are non-empty.
+
+    Returns (n_steps, holed, t_end, final_x, final_z, final_vx, final_vz);
+    final_x/z is the last on-green position.
+    """
+    nz, nx = Y.shape
+    record = path_x.shape[0] > 0
+    inv_res = 1.0 / res
+
+    n = 0
+    holed = False
+    t = 0.0
+    last_x = px
+    last_z = pz
+
+    for _ in range(max_steps):
+        ix, tx = _cell((px - x0) * inv_res, nx)
+        iz, tz = _cell((pz - z0) * inv_res, nz)
+
+        # Stop if ball leaves green
+        f = flags[iz, ix]
+        if not f & INSIDE:
+            break
+        bilinear = (f & BILINEAR) != 0
+
+        if record:
+            path_x[n] = px
+            path_z[n] = pz
+            path_y[n] = _sample(Y, bilinear, iz, ix, tz, tx)
+        n += 1
+        last_x = px
+        last_z = pz
+
+        d2 = (px - cup_x) * (px - cup_x) + (pz - cup_z) * (pz - cup_z)
+        speed = math.sqrt(vx * vx + vz * vz)
+        if stimp_mode:
+            if speed < stop_speed:
+                break
+            # Hole check (capture)
+            if d2 <= cup_r2 and speed <= max_cup_speed:
+                holed = True
+                break
+        else:
+            if d2 <= cup_r2:
+                holed = True
+                break
+            if speed < stop_speed:
+                break
+
+        # Downhill acceleration from slope
+        ax = -G_FTPS2 * _sample(gx, bilinear, iz, ix, tz, tx)
+        az = -G_FTPS2 * _sample(gz, bilinear, iz, ix, tz, tx)
+
+        # Rolling resistance
+        if stimp_mode:
+            inv = k_or_a0 / (speed + 1e-12)
+            ax -= vx * inv
+            az -= vz * inv
+        else:
+            ax -= k_or_a0 * vx
+            az -= k_or_a0 * vz
+
+        # Semi-implicit Euler
+        vx += ax * dt
+        vz += az * dt
+        px += vx * dt
+        pz += vz * dt
+        t += dt
+
+    return n, holed, t, last_x, last_z, vx, vz
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def simulate_core(Y, gx, gz, flags, x0, z0, res, px, pz, vx, vz, dt, k_or_a0, stimp_mode,
+                  stop_speed, max_steps, cup_x, cup_z, cup_r2, max_cup_speed):
+    """
+    Roll one ball and record its path.
+
+    Releases the GIL, so threads can roll shots concurrently.
+    Pass cup_r2 < 0 to disable the hole check. Returns
+    (path_x, path_z, path_y, holed, t_end, final_x, final_z, final_vx, final_vz).
+    """
+    path_x = np.empty(max_steps, np.float32)
+    path_z = np.empty(max_steps, np.float32)
+    path_y = np.empty(max_steps, np.float32)
+
+    n, holed, t, fx, fz, fvx, fvz = _integrate(
+        Y, gx, gz, flags, x0, z0, res, px, pz, vx, vz, dt, k_or_a0, stimp_mode,
+        stop_speed, max_steps, cup_x, cup_z, cup_r2, max_cup_speed,
+        path_x, path_z, path_y,
+    )
+    return path_x[:n], path_z[:n], path_y[:n], holed, t, fx, fz, fvx, fvz
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def sweep_core(Y, gx, gz, flags, x0, z0, res, px, pz, v0x, v0z, dt, k_or_a0, stimp_mode,
+               stop_speed, max_steps, cup_x, cup_z, cup_r2, max_cup_speed):
+    """
+    Roll one ball per (v0x[i], v0z[i]) launch from the same start, in parallel.
+
+    Paths are not recorded. Returns (final_x, final_z, final_speed, holed, t_end) arrays.
+    """
+    n_shots = v0x.shape[0]
+    final_x = np.empty(n_shots, np.float64)
+    final_z = np.empty(n_shots, np.float64)
+    final_speed = np.empty(n_shots, np.float64)
+    holed = np.empty(n_shots, np.bool_)
+    t_end = np.empty(n_shots, np.float64)
+    no_path = np.empty(0, np.float32)
+
+    for i in prange(n_shots):
+        _, h, t, fx, fz, fvx, fvz = _integrate(
+            Y, gx, gz, flags, x0, z0, res, px, pz, v0x[i], v0z[i], dt, k_or_a0, stimp_mode,
+            stop_speed, max_steps, cup_x, cup_z, cup_r2, max_cup_speed,
+            no_path, no_path, no_path,
+        )
+        final_x[i] = fx
+        final_z[i] = fz
+        final_speed[i] = math.sqrt(fvx * fvx + fvz * fvz)
+        holed[i] = h
+        t_end[i] = t
+
+    return final_x, final_z, final_speed, holed, t_end
+
@@ -1,6 +1,6 @@
 import numpy as np
 
-G_FTPS2 = 32.174  # gravity in ft/s^2
+from ._roll_numba import G_FTPS2, cell_flags, simulate_core, sweep_core
 
 
 class BallRollSimulator:
@@ -34,15 +34,26 @@ class BallRollSimulator:
         self.k = float(k_resist)
         self.stop_speed = float(stop_speed_fps)
         self.max_time = float(max_time_s)
+        self._max_steps = int(self.max_time / self.dt)  # path buffer length
         self.cup_r = float(cup_radius_ft)
+        self._cup_r2 = self.cup_r ** 2
 
         if getattr(self.hm, "grad_x", None) is None or getattr(self.hm, "grad_z", None) is None:
             raise RuntimeError("HeightMap gradients not computed. Call hm.compute_gradients() first.")
 
-    def _inside_green(self, x_ft: float, z_ft: float) -> bool:
-        # nearest index and mask check
-        iz, ix = self.hm._index_of(x_ft, z_ft)
-        return bool(self.hm.mask[iz, ix])
+        # Everything the compiled integrator needs besides the launch, bound once so
+        # each simulate() call is a single kernel call. Y and the gradients are passed
+        # by reference in their stored dtype; only per-ball state is float64.
+        # ascontiguousarray is a no-op for the usual C-ordered grids and keeps the
+        # kernels on their contiguous (vectorizable) specialization otherwise.
+        self._terrain = (
+            np.ascontiguousarray(self.hm.Y),
+            np.ascontiguousarray(self.hm.grad_x),
+            np.ascontiguousarray(self.hm.grad_z),
+            cell_flags(np.ascontiguousarray(self.hm.mask, dtype=np.bool_)),
+            self.hm.x_min_ft, self.hm.z_min_ft, self.hm.resolution_ft,
+        )
+        self._model = (self.dt, self.k, False, self.stop_speed, self._max_steps)
 
     def simulate(
         self,
@@ -59,58 +70,47 @@ class BallRollSimulator:
           holed (bool)
           t_end (float)
         """
-        p = np.array([float(start_x_ft), float(start_z_ft)], dtype=float)
-        v = np.array([float(v0_x_fps), float(v0_z_fps)], dtype=float)
+        has_hole = hole_x_ft is not None and hole_z_ft is not None
+
+        path_x, path_z, path_y, holed, t, _, _, _, _ = simulate_core(
+            *self._terrain,
+            float(start_x_ft), float(start_z_ft), float(v0_x_fps), float(v0_z_fps),
+            *self._model,
+            float(hole_x_ft) if has_hole else 0.0,
+            float(hole_z_ft) if has_hole else 0.0,
+            self._cup_r2 if has_hole else -1.0,
+            np.inf,
+        )
 
-        path_x = []
-        path_z = []
-        path_y = []
-
-        holed = False
-        t = 0.0
-
-        steps = int(self.max_time / self.dt)
-        for _ in range(steps):
-            x, z = float(p[0]), float(p[1])
-
-            # Stop if ball leaves green
-            if not self._inside_green(x, z):
-                break
-
-            y = self.hm.get_height_at(x, z)
-            path_x.append(x)
-            path_z.append(z)
-            path_y.append(y)
-
-            # Hole check (optional)
-            if hole_x_ft is not None and hole_z_ft is not None:
-                if (x - hole_x_ft) ** 2 + (z - hole_z_ft) ** 2 <= self.cup_r ** 2:
-                    holed = True
-                    break
-
-            speed = float(np.linalg.norm(v))
-            if speed < self.stop_speed:
-                break
-
-            # Downhill acceleration from slope
-            grad = self.hm.get_gradient_at(x, z)  # [dh/dx, dh/dz]
-            a_gravity = -G_FTPS2 * grad  # downhill
-
-            # Rolling resistance (linear damping)
-            a_resist = -self.k * v
-
-            a = a_gravity + a_resist
+        return {
+            "path_x": path_x,
+            "path_z": path_z,
+            "path_y": path_y,
+            "holed": bool(holed),
+            "t_end": float(t),
+        }
 
-            # Semi-implicit Euler
-            v = v + a * self.dt
-            p = p + v * self.dt
+    def simulate_batch(self, start_x_ft, start_z_ft, v0_x_fps, v0_z_fps, hole_x_ft, hole_z_ft):
+        """
+        Roll many launches (arrays v0_x_fps, v0_z_fps) from one start point, in parallel.
+        Paths are not recorded.
 
-            t += self.dt
+        Returns dict of arrays: final_x, final_z, final_speed, holed, t_end
+        """
+        final_x, final_z, final_speed, holed, t_end = sweep_core(
+            *self._terrain,
+            float(start_x_ft), float(start_z_ft),
+            np.ascontiguousarray(v0_x_fps, dtype=np.float64),
+            np.ascontiguousarray(v0_z_fps, dtype=np.float64),
+            *self._model,
+            float(hole_x_ft), float(hole_z_ft), self._cup_r2,
+            np.inf,
+        )
 
         return {
-            "path_x": np.array(path_x),
-            "path_z": np.array(path_z),
-            "path_y": np.array(path_y),
+            "final_x": final_x,
+            "final_z": final_z,
+            "final_speed": final_speed,
             "holed": holed,
-            "t_end": t,
+            "t_end": t_end,
         }
@@ -1,6 +1,9 @@
+import math
+
 import numpy as np
 
-G_FTPS2 = 32.174  # ft/s^2
+from ._roll_numba import G_FTPS2, cell_flags, simulate_core, sweep_core
+
 DEFAULT_STIMP_LAUNCH_FPS = 6.0  # Stimpmeter exit speed proxy
 
 
@@ -30,7 +33,9 @@ class BallRollSimulatorStimp:
         self.dt = float(dt)
         self.stop_speed = float(stop_speed_fps)
         self.max_time = float(max_time_s)
+        self._max_steps = int(self.max_time / self.dt)  # path buffer length
         self.cup_r = float(cup_radius_ft)
+        self._cup_r2 = self.cup_r ** 2
         self.max_cup_speed = float(max_cup_speed_fps)
 
         self.stimp_ft = float(stimp_ft)
@@ -45,63 +50,65 @@ class BallRollSimulatorStimp:
         if getattr(self.hm, "grad_x", None) is None or getattr(self.hm, "grad_z", None) is None:
             raise RuntimeError("HeightMap gradients not computed. Call hm.compute_gradients() first.")
 
-    def _inside_green(self, x_ft: float, z_ft: float) -> bool:
-        iz, ix = self.hm._index_of(x_ft, z_ft)
-        return bool(self.hm.mask[iz, ix])
+        # Everything the compiled integrator needs besides the launch, bound once so
+        # each simulate() call is a single kernel call. Y and the gradients are passed
+        # by reference in their stored dtype; only per-ball state is float64.
+        # ascontiguousarray is a no-op for the usual C-ordered grids and keeps the
+        # kernels on their contiguous (vectorizable) specialization otherwise.
+        self._terrain = (
+            np.ascontiguousarray(self.hm.Y),
+            np.ascontiguousarray(self.hm.grad_x),
+            np.ascontiguousarray(self.hm.grad_z),
+            cell_flags(np.ascontiguousarray(self.hm.mask, dtype=np.bool_)),
+            self.hm.x_min_ft, self.hm.z_min_ft, self.hm.resolution_ft,
+        )
+        self._model = (self.dt, self.a0, True, self.stop_speed, self._max_steps)
 
     def simulate(self, start_x_ft, start_z_ft, v0_x_fps, v0_z_fps, hole_x_ft=None, hole_z_ft=None):
-        p = np.array([float(start_x_ft), float(start_z_ft)], dtype=float)
-        v = np.array([float(v0_x_fps), float(v0_z_fps)], dtype=float)
-
-        path_x, path_z, path_y = [], [], []
-        holed = False
-        t = 0.0
-
-        steps = int(self.max_time / self.dt)
-        for _ in range(steps):
-            x, z = float(p[0]), float(p[1])
-
-            if not self._inside_green(x, z):
-                break
-
-            y = self.hm.get_height_at(x, z)
-            path_x.append(x)
-            path_z.append(z)
-            path_y.append(y)
+        has_hole = hole_x_ft is not None and hole_z_ft is not None
+
+        path_x, path_z, path_y, holed, t, final_x, final_z, vx, vz = simulate_core(
+            *self._terrain,
+            float(start_x_ft), float(start_z_ft), float(v0_x_fps), float(v0_z_fps),
+            *self._model,
+            float(hole_x_ft) if has_hole else 0.0,
+            float(hole_z_ft) if has_hole else 0.0,
+            self._cup_r2 if has_hole else -1.0,
+            self.max_cup_speed,
+        )
 
-            speed = float(np.linalg.norm(v))
-            if speed < self.stop_speed:
-                break
-
-            # Hole check (capture)
-            if hole_x_ft is not None and hole_z_ft is not None:
-                d2 = (x - hole_x_ft) ** 2 + (z - hole_z_ft) ** 2
-                if d2 <= self.cup_r ** 2 and speed <= self.max_cup_speed:
-                    holed = True
-                    break
-
-            # Gravity along slope
-            grad = self.hm.get_gradient_at(x, z)  # [dh/dx, dh/dz]
-            a_gravity = -G_FTPS2 * grad
-
-            # Rolling resistance opposite velocity direction
-            vhat = v / (speed + 1e-12)
-            a_resist = -self.a0 * vhat
-
-            a = a_gravity + a_resist
+        return {
+            "path_x": path_x,
+            "path_z": path_z,
+            "path_y": path_y,
+            "holed": bool(holed),
+            "t_end": float(t),
+            "final_x": float(final_x),
+            "final_z": float(final_z),
+            "final_speed": math.hypot(vx, vz),
+        }
 
-            # semi-implicit Euler
-            v = v + a * self.dt
-            p = p + v * self.dt
-            t += self.dt
+    def simulate_batch(self, start_x_ft, start_z_ft, v0_x_fps, v0_z_fps, hole_x_ft, hole_z_ft):
+        """
+        Roll many launches (arrays v0_x_fps, v0_z_fps) from one start point, in parallel.
+        Paths are not recorded.
+
+        Returns dict of arrays: final_x, final_z, final_speed, holed, t_end
+        """
+        final_x, final_z, final_speed, holed, t_end = sweep_core(
+            *self._terrain,
+            float(start_x_ft), float(start_z_ft),
+            np.ascontiguousarray(v0_x_fps, dtype=np.float64),
+            np.ascontiguousarray(v0_z_fps, dtype=np.float64),
+            *self._model,
+            float(hole_x_ft), float(hole_z_ft), self._cup_r2,
+            self.max_cup_speed,
+        )
 
         return {
-            "path_x": np.array(path_x),
-            "path_z": np.array(path_z),
-            "path_y": np.array(path_y),
+            "final_x": final_x,
+            "final_z": final_z,
+            "final_speed": final_speed,
             "holed": holed,
-            "t_end": t,
-            "final_x": float(path_x[-1]) if path_x else float(start_x_ft),
-            "final_z": float(path_z[-1]) if path_z else float(start_z_ft),
-            "final_speed": float(np.linalg.norm(v)),
+            "t_end": t_end,
         }
@@ -21,49 +21,47 @@ def best_line_grid_search(
     to_hole = np.array([hole_x_ft - ball_x_ft, hole_z_ft - ball_z_ft], dtype=float)
     base_angle = np.arctan2(to_hole[1], to_hole[0])  # radians (z over x)
 
-    best = None
-    all_results = []
-
     angles = np.arange(-angle_span_deg, angle_span_deg + 1e-9, angle_step_deg)
     speeds = np.arange(speed_min_fps, speed_max_fps + 1e-9, speed_step_fps)
 
-    for a_deg in angles:
-        ang = base_angle + np.deg2rad(a_deg)
-        dir_vec = np.array([np.cos(ang), np.sin(ang)], dtype=float)
-
-        for speed in speeds:
-            v0 = dir_vec * float(speed)
-
-            res = sim.simulate(
-                start_x_ft=ball_x_ft,
-                start_z_ft=ball_z_ft,
-                v0_x_fps=float(v0[0]),
-                v0_z_fps=float(v0[1]),
-                hole_x_ft=hole_x_ft,
-                hole_z_ft=hole_z_ft,
-            )
+    # Flatten the (angle, speed) grid, angle-major, and roll every launch in one parallel call
+    ang = base_angle + np.deg2rad(angles)
+    v0_x = np.outer(np.cos(ang), speeds).ravel()
+    v0_z = np.outer(np.sin(ang), speeds).ravel()
 
-            fx, fz = res["final_x"], res["final_z"]
-            miss = float(np.hypot(fx - hole_x_ft, fz - hole_z_ft))
+    out = sim.simulate_batch(ball_x_ft, ball_z_ft, v0_x, v0_z, hole_x_ft, hole_z_ft)
+    miss = np.hypot(out["final_x"] - hole_x_ft, out["final_z"] - hole_z_ft)
+    holed = out["holed"]
 
-            # Score: holed is best; otherwise minimize miss distance
-            # You can add more terms later (e.g., avoid big blow-bys)
-            if res["holed"]:
-                score = -1000.0 - miss  # massive bonus
-            else:
-                score = miss
+    # Score: holed is best; otherwise minimize miss distance
+    # You can add more terms later (e.g., avoid big blow-bys)
+    scores = np.where(holed, -1000.0 - miss, miss)  # massive bonus
 
-            all_results.append((float(a_deg), float(speed), float(score), bool(res["holed"]), float(miss)))
+    a_deg = np.repeat(angles, len(speeds))
+    s_fps = np.tile(speeds, len(angles))
+    all_results = [
+        (float(a), float(s), float(sc), bool(h), float(m))
+        for a, s, sc, h, m in zip(a_deg, s_fps, scores, holed, miss)
+    ]
 
-            if best is None or score < best["score"]:
-                best = {
-                    "angle_deg": float(a_deg),
-                    "speed_fps": float(speed),
-                    "v0_x_fps": float(v0[0]),
-                    "v0_z_fps": float(v0[1]),
-                    "score": float(score),
-                    "miss_ft": float(miss),
-                    "result": res,
-                }
+    # Re-run the winner to record its path
+    i = int(np.argmin(scores))
+    res = sim.simulate(
+        start_x_ft=ball_x_ft,
+        start_z_ft=ball_z_ft,
+        v0_x_fps=float(v0_x[i]),
+        v0_z_fps=float(v0_z[i]),
+        hole_x_ft=hole_x_ft,
+        hole_z_ft=hole_z_ft,
+    )
+    best = {
+        "angle_deg": float(a_deg[i]),
+        "speed_fps": float(s_fps[i]),
+        "v0_x_fps": float(v0_x[i]),
+        "v0_z_fps": float(v0_z[i]),
+        "score": float(scores[i]),
+        "miss_ft": float(miss[i]),
+        "result": res,
+    }
 
     return best, all_results
@@ -1,30 +1,35 @@
+import math
+
 import numpy as np
 
+BLOWBY_PENALTY = 0.15  # score per ft/s of leftover speed on a miss
+
+
+def _shot_score(final_x, final_z, final_speed, holed, hole_x, hole_z):
+    """
+    Score finished rolls (lower is better); scalars or arrays. Returns (score, miss_ft).
+
+    Holed: -1000 - miss. Otherwise miss + BLOWBY_PENALTY * final_speed, which penalizes
+    big blow-bys that "almost go in" but rocket past.
+    """
+    miss = np.hypot(final_x - hole_x, final_z - hole_z)
+    return np.where(holed, -1000.0 - miss, miss + BLOWBY_PENALTY * final_speed), miss
+
 
-def _simulate_score(sim, ball_x, ball_z, hole_x, hole_z, v0):
+def _simulate_score(sim, ball_x, ball_z, hole_x, hole_z, v0_x, v0_z):
     res = sim.simulate(
         start_x_ft=ball_x,
         start_z_ft=ball_z,
-        v0_x_fps=float(v0[0]),
-        v0_z_fps=float(v0[1]),
+        v0_x_fps=v0_x,
+        v0_z_fps=v0_z,
         hole_x_ft=hole_x,
         hole_z_ft=hole_z,
     )
 
-    fx, fz = res["final_x"], res["final_z"]
-    miss = float(np.hypot(fx - hole_x, fz - hole_z))
-
-    # Penalize big blow-bys (if not holed)
-    # This discourages lines that "almost go in" but rocket past.
-    final_speed = float(res.get("final_speed", 0.0))
-    blowby_penalty = 0.0 if res["holed"] else 0.15 * final_speed
-
-    if res["holed"]:
-        score = -1000.0 - miss
-    else:
-        score = miss + blowby_penalty
-
-    return score, miss, res
+    score, miss = _shot_score(
+        res["final_x"], res["final_z"], res.get("final_speed", 0.0), res["holed"], hole_x, hole_z
+    )
+    return float(score), float(miss), res
 
 
 def best_line_coarse_to_fine(
@@ -44,40 +49,53 @@ def best_line_coarse_to_fine(
       2) refine around best (smaller steps)
       3) final micro-refine
 
+    Each grid is rolled in one parallel sim.simulate_batch call; only its winner
+    is re-rolled to record the path. Local grids rather than 1-D line searches:
+    holed shots form a narrow plateau in the score, which line searches step over.
+
     Returns:
       dict with best params + result.
     """
 
-    to_hole = np.array([hole_x_ft - ball_x_ft, hole_z_ft - ball_z_ft], dtype=float)
-    base_ang = np.arctan2(to_hole[1], to_hole[0])
+    base_ang = math.atan2(hole_z_ft - ball_z_ft, hole_x_ft - ball_x_ft)
 
     def run_grid(angle_step, speed_step, center_angle_deg, center_speed, angle_window_deg, speed_window):
-        best = None
         angs = np.arange(center_angle_deg - angle_window_deg,
                          center_angle_deg + angle_window_deg + 1e-9,
                          angle_step)
         vmin, vmax = speed_window
         speeds = np.arange(vmin, vmax + 1e-9, speed_step)
 
-        for a_deg in angs:
-            ang = base_ang + np.deg2rad(a_deg)
-            d = np.array([np.cos(ang), np.sin(ang)], dtype=float)
-
-            for s in speeds:
-                v0 = d * float(s)
-                score, miss, res = _simulate_score(sim, ball_x_ft, ball_z_ft, hole_x_ft, hole_z_ft, v0)
-
-                if best is None or score < best["score"]:
-                    best = {
-                        "angle_deg": float(a_deg),
-                        "speed_fps": float(s),
-                        "v0_x_fps": float(v0[0]),
-                        "v0_z_fps": float(v0[1]),
-                        "score": float(score),
-                        "miss_ft": float(miss),
-                        "result": res,
-                    }
-        return best
+        # Direction table for the whole sweep, one vectorized trig call per axis
+        angs_rad = base_ang + np.deg2rad(angs)
+        cos_tab = np.cos(angs_rad)
+        sin_tab = np.sin(angs_rad)
+
+        # Angle-major launch grid, rolled in one batch without paths
+        v0_x = np.outer(cos_tab, speeds).ravel()
+        v0_z = np.outer(sin_tab, speeds).ravel()
+        out = sim.simulate_batch(ball_x_ft, ball_z_ft, v0_x, v0_z, hole_x_ft, hole_z_ft)
+
+        scores, _ = _shot_score(out["final_x"], out["final_z"], out["final_speed"], out["holed"],
+                                hole_x_ft, hole_z_ft)
+
+        # argmin keeps the first minimum, i.e. the same tie-break as a running min
+        k = int(np.argmin(scores))
+        i_ang, i_spd = divmod(k, len(speeds))
+        v0_x_k = float(v0_x[k])
+        v0_z_k = float(v0_z[k])
+
+        # Re-roll the winner alone to get its path
+        score, miss_k, res = _simulate_score(sim, ball_x_ft, ball_z_ft, hole_x_ft, hole_z_ft, v0_x_k, v0_z_k)
+        return {
+            "angle_deg": float(angs[i_ang]),
+            "speed_fps": float(speeds[i_spd]),
+            "v0_x_fps": v0_x_k,
+            "v0_z_fps": v0_z_k,
+            "score": float(score),
+            "miss_ft": float(miss_k),
+            "result": res,
+        }
 
     # Stage 1: coarse
     best1 = run_grid(
@@ -75,7 +75,8 @@ class BestLineResult:
             final_x_ft=float(res["final_x"]),
             final_z_ft=float(res["final_z"]),
 
-            path_x_ft=[float(x) for x in res["path_x"]],
-            path_z_ft=[float(z) for z in res["path_z"]],
-            path_y_ft=[float(y) for y in res["path_y"]],
+            # One C-level conversion per path; stays List[float] for JSON
+            path_x_ft=np.asarray(res["path_x"], dtype=np.float64).tolist(),
+            path_z_ft=np.asarray(res["path_z"], dtype=np.float64).tolist(),
+            path_y_ft=np.asarray(res["path_y"], dtype=np.float64).tolist(),
         )
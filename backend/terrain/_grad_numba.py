@@ -0,0 +1,59 @@
+"""
+Numba kernel that turns a raw heightfield buffer into mask + gradients in one pass.
+"""
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def _filled(Y, r, c, zero):
+    v = Y[r, c]
+    return v if v > zero else zero
+
+
+@njit(cache=True, parallel=True)
+def mask_and_gradients(Y, res):
+    """
+    Y: (nz, nx) heightfield where cells outside the green are <= 0 (or NaN).
+
+    Returns (mask, grad_x, grad_z, slope), identical to `mask = Y > 0` followed by
+    HeightMap.compute_gradients(): outside cells read as 0 in the stencil
+    (central differences inside, one-sided at the edges) and come out NaN.
+    Arithmetic stays in Y's dtype.
+    """
+    nz, nx = Y.shape
+    zero = Y.dtype.type(0)
+    nan = Y.dtype.type(np.nan)
+    inv_2h = Y.dtype.type(0.5 / res)
+    inv_h = Y.dtype.type(1.0 / res)
+
+    mask = np.empty((nz, nx), np.bool_)
+    # C-order outputs even if Y is a strided/Fortran view
+    gx = np.empty((nz, nx), Y.dtype)
+    gz = np.empty((nz, nx), Y.dtype)
+    slope = np.empty((nz, nx), Y.dtype)
+
+    for r in prange(nz):
+        r0 = max(r - 1, 0)
+        r1 = min(r + 1, nz - 1)
+        z_scale = inv_2h if 0 < r < nz - 1 else inv_h
+        for c in range(nx):
+            if not Y[r, c] > zero:
+                mask[r, c] = False
+                gx[r, c] = nan
+                gz[r, c] = nan
+                slope[r, c] = nan
+                continue
+
+            c0 = max(c - 1, 0)
+            c1 = min(c + 1, nx - 1)
+            x_scale = inv_2h if 0 < c < nx - 1 else inv_h
+
+            dx = (_filled(Y, r, c1, zero) - _filled(Y, r, c0, zero)) * x_scale
+            dz = (_filled(Y, r1, c, zero) - _filled(Y, r0, c, zero)) * z_scale
+            mask[r, c] = True
+            gx[r, c] = dx
+            gz[r, c] = dz
+            slope[r, c] = np.hypot(dx, dz)
+
+    return mask, gx, gz, slope
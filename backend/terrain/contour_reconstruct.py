@@ -1,25 +1,156 @@
+import hashlib
+import os
+import pickle
+
+import cv2
 import numpy as np
-from shapely.geometry import Point, Polygon
+import scipy.sparse as sp
+import shapely
 from scipy.interpolate import RBFInterpolator
+from scipy.sparse.linalg import spsolve
+from shapely.geometry import Polygon
+
+from backend.maps._poly_numba import grid_inside
+
+# Fitted interpolators keyed by a digest of (samples, heights, smoothing, neighbors).
+# Fitting solves a dense N x N system; re-builds of the same green in one
+# process reuse the solved interpolator instead of factoring again. With a
+# cache_dir the fit is also pickled to disk, so re-exports across runs skip it;
+# only the newest _RBF_DISK_CACHE_SIZE pickles per directory are kept. Pickles
+# are only ever loaded from a cache_dir this tool writes itself.
+_RBF_CACHE_SIZE = 8
+_RBF_DISK_CACHE_SIZE = 4
+_rbf_cache: dict[bytes, RBFInterpolator] = {}
+
+
+def _prune_rbf_disk_cache(cache_dir: str) -> None:
+    """Delete all but the newest _RBF_DISK_CACHE_SIZE pickles in cache_dir."""
+    with os.scandir(cache_dir) as it:
+        pickles = [e for e in it if e.name.endswith(".pkl") and e.is_file()]
+    pickles.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in pickles[_RBF_DISK_CACHE_SIZE:]:
+        try:
+            os.remove(e.path)
+        except FileNotFoundError:
+            pass  # pruned concurrently
+
+
+def _fit_rbf(Xs: np.ndarray, ys: np.ndarray, smooth: float, neighbors: int | None,
+             cache_dir: str | None = None) -> RBFInterpolator:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.ascontiguousarray(Xs, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(ys, dtype=np.float64).tobytes())
+    h.update(np.float64(smooth).tobytes())
+    h.update(np.int64(-1 if neighbors is None else neighbors).tobytes())
+    key = h.digest()
+
+    rbf = _rbf_cache.pop(key, None)
+    cache_file = os.path.join(cache_dir, f"{key.hex()}.pkl") if cache_dir else None
+    if rbf is None and cache_file is not None:
+        try:
+            with open(cache_file, "rb") as f:
+                rbf = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            rbf = None  # missing or stale (e.g. written by another SciPy) -> refit
+    if rbf is None:
+        rbf = RBFInterpolator(Xs, ys, kernel="thin_plate_spline", smoothing=smooth, neighbors=neighbors)
+        if cache_file is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(rbf, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+            _prune_rbf_disk_cache(cache_dir)
+    if len(_rbf_cache) >= _RBF_CACHE_SIZE:
+        _rbf_cache.pop(next(iter(_rbf_cache)))  # evict least recently used
+    _rbf_cache[key] = rbf
+    return rbf
+
+
+def _raster_inside(boundary_poly: Polygon, x_axis: np.ndarray, z_axis: np.ndarray) -> np.ndarray:
+    """
+    Scanline-rasterize the boundary (holes included) onto the uniform grid with
+    cv2.fillPoly. Vertices are mapped to fractional grid indices with 8 bits of
+    sub-cell precision. Returns bool mask of shape (nz, nx).
+    """
+    res = float(x_axis[1] - x_axis[0])
+    x0 = float(x_axis[0])
+    z0 = float(z_axis[0])
+    shift = 8
+
+    rings = []
+    for ring in (boundary_poly.exterior, *boundary_poly.interiors):
+        xz = np.asarray(ring.coords, dtype=np.float64)
+        uv = np.column_stack([(xz[:, 0] - x0) / res, (xz[:, 1] - z0) / res])
+        rings.append(np.round(uv * (1 << shift)).astype(np.int32))
+
+    mask = np.zeros((len(z_axis), len(x_axis)), np.uint8)
+    cv2.fillPoly(mask, rings, 1, lineType=cv2.LINE_8, shift=shift)
+    return mask.view(bool)
+
+
+def _grid_laplacian_1d(n: int) -> sp.csr_matrix:
+    # Second-difference operator with zero-flux ends
+    main = np.full(n, 2.0)
+    main[0] = main[-1] = 1.0
+    off = -np.ones(n - 1)
+    return sp.diags([off, main, off], [-1, 0, 1], format="csr")
+
+
+def _biharmonic_grid(Xs: np.ndarray, ys: np.ndarray, x_axis: np.ndarray, z_axis: np.ndarray,
+                     min_density: float):
+    """
+    Solve the biharmonic equation on the regular grid with every contour sample
+    pinned to its nearest cell (heights averaged when several share a cell).
+
+    Minimizes ||L u||^2 (L = 5-point Laplacian, zero-flux edges) over the free
+    cells with one sparse direct solve. Returns the (nz, nx) float64 surface, or
+    None when pinned cells cover less than min_density of the grid.
+    """
+    nx, nz = len(x_axis), len(z_axis)
+    res = float(x_axis[1] - x_axis[0])
+    ix = np.clip(np.rint((Xs[:, 0] - float(x_axis[0])) / res).astype(np.intp), 0, nx - 1)
+    iz = np.clip(np.rint((Xs[:, 1] - float(z_axis[0])) / res).astype(np.intp), 0, nz - 1)
+    cell = iz * nx + ix
+
+    n = nx * nz
+    counts = np.bincount(cell, minlength=n)
+    known = counts > 0
+    if known.sum() < min_density * n:
+        return None
+
+    u = np.zeros(n)
+    u[known] = np.bincount(cell, weights=ys, minlength=n)[known] / counts[known]
+
+    L = sp.kron(sp.identity(nz), _grid_laplacian_1d(nx)) + sp.kron(_grid_laplacian_1d(nz), sp.identity(nx))
+    A = (L.T @ L).tocsr()
+    free = ~known
+    u[free] = spsolve(A[free][:, free].tocsc(), -(A[free][:, known] @ u[known]))
+    return u.reshape(nz, nx)
 
 
 def sample_polyline(points_xz, step_ft: float = 1.0):
     """
     Densify a polyline by sampling roughly every step_ft along segments.
-    points_xz: list of (x,z)
-    Returns list of sampled (x,z)
+    points_xz: list of (x,z) or (N,2) array
+    Returns (M,2) float64 array of sampled (x,z); the last vertex is always included
     """
-    pts = []
-    for i in range(len(points_xz) - 1):
-        x1, z1 = points_xz[i]
-        x2, z2 = points_xz[i + 1]
-        dx, dz = x2 - x1, z2 - z1
-        dist = float(np.hypot(dx, dz))
-        n = max(1, int(dist / step_ft))
-        for t in np.linspace(0, 1, n, endpoint=False):
-            pts.append((x1 + t * dx, z1 + t * dz))
-    pts.append(points_xz[-1])
-    return pts
+    pts = np.asarray(points_xz, dtype=np.float64).reshape(-1, 2)
+    if len(pts) < 2:
+        return pts.copy()
+
+    d = pts[1:] - pts[:-1]
+    ns = np.maximum(1, (np.hypot(d[:, 0], d[:, 1]) / step_ft).astype(np.int64))
+
+    # n evenly spaced t in [0, 1) per segment, all segments at once
+    seg = np.repeat(np.arange(len(d)), ns)
+    k = np.arange(len(seg)) - np.repeat(np.cumsum(ns) - ns, ns)
+    t = k / ns[seg]
+
+    out = np.empty((len(seg) + 1, 2), dtype=np.float64)
+    out[:-1] = pts[seg] + t[:, None] * d[seg]
+    out[-1] = pts[-1]
+    return out
 
 
 def reconstruct_heightfield_from_contours(
@@ -29,43 +160,98 @@ def reconstruct_heightfield_from_contours(
     grid_z: np.ndarray,
     sample_step_ft: float = 1.0,
     smooth: float = 0.1,
+    neighbors: int | None = None,
+    dtype=np.float32,
+    cache_dir: str | None = None,
+    chunk: int = 64_000,
+    mask_method: str = "raycast",
+    method: str = "rbf",
+    min_density: float = 0.02,
 ):
     """
-    boundary_poly: shapely Polygon in (x,z) feet
-    contours: list of dicts { "height_ft": float, "points_xz": [(x,z), ...] }
-    grid_x, grid_z: meshgrid arrays (same shape)
+    boundary_poly: shapely Polygon in (x,z) feet (ideally shapely.prepare()d)
+    contours: list of dicts { "height_ft": float, "points_xz": (N,2) array or [(x,z), ...] }
+    grid_x, grid_z: meshgrid arrays, dense or sparse (broadcastable to the grid shape)
+    neighbors: fit each grid point to its K nearest samples (None = one global solve).
+      Only pays off for very large sample sets; at a few thousand samples the
+      global solve is faster, and K=50 moves heights by up to ~0.25 ft.
+    dtype: dtype of the returned heightfield (float32 by default; the RBF itself is fit in float64)
+    cache_dir: if set, fitted interpolators are pickled here and reused across runs
+    chunk: grid points per RBF evaluation batch (caps peak memory on large greens)
+    mask_method: "raycast" (exact point-in-polygon, default) or "raster"
+      (cv2.fillPoly scanline fill; fastest on very fine grids, but cells whose
+      node sits within a fraction of a cell from the edge may flip)
+    method: "rbf" (thin-plate spline, default) or "biharmonic" (sparse solve on the
+      grid with samples pinned to their nearest cell; falls back to RBF when
+      pinned cells cover less than min_density of the grid). On the PresidioGC
+      greens the two agree to within ~0.13 ft max.
     Returns:
       Y_ft (same shape), mask_inside (bool same shape)
     """
     # 1) Build sample constraints from contours
-    xs, zs, hs = [], [], []
-    for c in contours:
-        h = float(c["height_ft"])
-        pts = sample_polyline(c["points_xz"], step_ft=sample_step_ft)
-        for (x, z) in pts:
-            xs.append(x)
-            zs.append(z)
-            hs.append(h)
-
-    if len(xs) < 10:
+    samples = [sample_polyline(c["points_xz"], step_ft=sample_step_ft) for c in contours]
+    n_samples = sum(len(p) for p in samples)
+
+    if n_samples < 10:
         raise RuntimeError("Not enough contour samples. Trace more/longer contours.")
 
-    Xs = np.column_stack([np.array(xs), np.array(zs)])
-    ys = np.array(hs)
+    Xs = np.concatenate(samples)
+    ys = np.repeat([float(c["height_ft"]) for c in contours], [len(p) for p in samples])
 
-    # 2) Interpolator (thin-plate spline style)
-    # smooth: larger -> smoother surface, less exact contour fit
-    rbf = RBFInterpolator(Xs, ys, kernel="thin_plate_spline", smoothing=smooth)
+    if method not in ("rbf", "biharmonic"):
+        raise ValueError(f"Unknown method: {method!r}")
 
-    # 3) Evaluate on grid
-    pts_grid = np.column_stack([grid_x.ravel(), grid_z.ravel()])
-    Y = rbf(pts_grid).reshape(grid_x.shape)
+    grid_x, grid_z = np.broadcast_arrays(grid_x, grid_z)
 
-    # 4) Mask outside boundary
-    inside = np.vectorize(lambda x, z: boundary_poly.contains(Point(x, z)))(grid_x, grid_z)
-    Y[~inside] = np.nan
+    Y = None
+    if method == "biharmonic":
+        U = _biharmonic_grid(Xs, ys, grid_x[0, :], grid_z[:, 0], min_density)
+        if U is not None:
+            Y = U.astype(dtype)
 
-    # 5) Normalize so min inside is 0
-    Y = Y - np.nanmin(Y)
+    if Y is None:
+        # 2) Interpolator (thin-plate spline style)
+        # smooth: larger -> smoother surface, less exact contour fit
+        # (RBFInterpolator builds the pairwise kernel matrix in compiled code)
+        rbf = _fit_rbf(Xs, ys, smooth, None if neighbors is None else min(neighbors, len(ys)),
+                       cache_dir=cache_dir)
+
+        # 3) Evaluate on grid, `chunk` points at a time: peak memory is bounded by the
+        # (chunk x N) kernel block, and results land directly in the output dtype.
+        gx = grid_x.ravel()
+        gz = grid_z.ravel()
+        Y_flat = np.empty(gx.size, dtype=dtype)
+        for i in range(0, gx.size, chunk):
+            pts = np.column_stack([gx[i:i + chunk], gz[i:i + chunk]])
+            Y_flat[i:i + chunk] = rbf(pts)
+        Y = Y_flat.reshape(grid_x.shape)
+
+    # 4) Mask outside boundary.
+    # Simple polygons: compiled ray-cast over the regular grid rows.
+    # Polygons with holes: vectorized GEOS predicate (prepares the polygon if needed).
+    # Edge semantics: GEOS "contains" is strict, so points exactly on the boundary
+    # are outside. The ray-cast is half-open and counts points exactly on a
+    # left/bottom edge as inside. On traced (float) boundaries no 0.5 ft grid node
+    # lands exactly on an edge, so both give the same mask.
+    # mask_method="raster" swaps in a cv2 scanline fill instead.
+    if mask_method == "raster":
+        inside = _raster_inside(boundary_poly, grid_x[0, :], grid_z[:, 0])
+    elif mask_method != "raycast":
+        raise ValueError(f"Unknown mask_method: {mask_method!r}")
+    elif len(boundary_poly.interiors) == 0:
+        ring = np.asarray(boundary_poly.exterior.coords, dtype=np.float64)
+        inside = grid_inside(
+            np.ascontiguousarray(ring[:, 0]),
+            np.ascontiguousarray(ring[:, 1]),
+            np.ascontiguousarray(grid_x[0, :], dtype=np.float64),
+            np.ascontiguousarray(grid_z[:, 0], dtype=np.float64),
+        ).view(bool)
+    else:
+        inside = shapely.contains_xy(boundary_poly, grid_x, grid_z)
+
+    # 5) Normalize so min inside is 0, then blank the outside.
+    # Y is a fresh output buffer, so both steps are in place.
+    Y -= Y[inside].min()
+    Y[~inside] = np.nan
 
     return Y, inside
@@ -1,5 +1,9 @@
+import math
+
 import numpy as np
 
+from ._grad_numba import mask_and_gradients
+
 
 class HeightMap:
     """
@@ -11,15 +15,18 @@ class HeightMap:
       - Y (feet): elevation (up)
     """
 
-    def __init__(self, X: np.ndarray, Z: np.ndarray, Y: np.ndarray, resolution_ft: float, mask: np.ndarray | None = None):
-        if X.shape != Z.shape or X.shape != Y.shape:
-            raise ValueError("X, Z, Y must have the same shape")
-
-        self.X = X
-        self.Z = Z
+    def __init__(self, Y: np.ndarray, resolution_ft: float, x_min_ft: float, z_min_ft: float, mask: np.ndarray | None = None):
+        """
+        Y: (nz, nx) elevations on a uniform grid; column ix sits at
+        x_min_ft + ix * resolution_ft and row iz at z_min_ft + iz * resolution_ft.
+        """
         self.Y = Y
         self.resolution_ft = float(resolution_ft)
 
+        # Grid origin, for O(1) point -> cell lookups on the uniform grid
+        self.x_min_ft = float(x_min_ft)
+        self.z_min_ft = float(z_min_ft)
+
         self.mask = mask  # True where valid (inside green)
         if self.mask is None:
             self.mask = ~np.isnan(self.Y)
@@ -29,6 +36,18 @@ class HeightMap:
         self.grad_z = None  # dY/dZ
         self.slope = None   # sqrt(grad_x^2 + grad_z^2)
 
+    @property
+    def X(self) -> np.ndarray:
+        """(1, nx) column coordinates in feet; broadcasts against Y."""
+        nx = self.Y.shape[1]
+        return (np.arange(nx, dtype=np.float64) * self.resolution_ft + self.x_min_ft).reshape(1, nx)
+
+    @property
+    def Z(self) -> np.ndarray:
+        """(nz, 1) row coordinates in feet; broadcasts against Y."""
+        nz = self.Y.shape[0]
+        return (np.arange(nz, dtype=np.float64) * self.resolution_ft + self.z_min_ft).reshape(nz, 1)
+
     @classmethod
     def circular(cls, radius_ft: float, resolution_ft: float) -> "HeightMap":
         """
@@ -37,17 +56,30 @@ class HeightMap:
         radius_ft = float(radius_ft)
         resolution_ft = float(resolution_ft)
 
-        x = np.arange(-radius_ft, radius_ft + resolution_ft, resolution_ft)
-        z = np.arange(-radius_ft, radius_ft + resolution_ft, resolution_ft)
-        X, Z = np.meshgrid(x, z)
+        x = np.arange(-radius_ft, radius_ft + resolution_ft, resolution_ft).astype(np.float32)
+        z = np.arange(-radius_ft, radius_ft + resolution_ft, resolution_ft).astype(np.float32)
 
-        Y = np.zeros_like(X, dtype=float)
-        mask = (X**2 + Z**2) <= radius_ft**2
+        Y = np.zeros((z.size, x.size), dtype=np.float32)
+        mask = (x[None, :] ** 2 + z[:, None] ** 2) <= radius_ft**2
 
         # Outside the circle -> NaN so plots & computations naturally ignore it
         Y[~mask] = np.nan
 
-        return cls(X=X, Z=Z, Y=Y, resolution_ft=resolution_ft, mask=mask)
+        return cls(Y=Y, resolution_ft=resolution_ft, x_min_ft=x[0], z_min_ft=z[0], mask=mask)
+
+    @classmethod
+    def from_buffer(cls, Y: np.ndarray, resolution_ft: float, x_min_ft: float, z_min_ft: float) -> "HeightMap":
+        """
+        Build from a raw (nz, nx) heightfield buffer as stored in heightfield.bin
+        (cells outside the green are 0). Mask and gradients come out of a single
+        fused pass over Y, so compute_gradients() is not needed.
+        """
+        mask, grad_x, grad_z, slope = mask_and_gradients(Y, float(resolution_ft))
+        hm = cls(Y=Y, resolution_ft=resolution_ft, x_min_ft=x_min_ft, z_min_ft=z_min_ft, mask=mask)
+        hm.grad_x = grad_x
+        hm.grad_z = grad_z
+        hm.slope = slope
+        return hm
 
     def add_planar_slope(self, slope_x: float = 0.0, slope_z: float = 0.0) -> None:
         """
@@ -57,7 +89,8 @@ class HeightMap:
         Example:
           - 2% slope in +Z direction  => slope_z = 0.02
         """
-        self.Y[self.mask] = self.Y[self.mask] + slope_x * self.X[self.mask] + slope_z * self.Z[self.mask]
+        delta = slope_x * self.X + slope_z * self.Z
+        np.add(self.Y, delta, out=self.Y, where=self.mask)
 
     def add_gaussian_bump(self, center_x_ft: float, center_z_ft: float, height_ft: float, sigma_ft: float) -> None:
         """
@@ -72,47 +105,63 @@ class HeightMap:
 
         dx = self.X - cx
         dz = self.Z - cz
-        bump = h * np.exp(-(dx**2 + dz**2) / (2.0 * s**2))
+        bump = h * np.exp(-(dx * dx + dz * dz) / (2.0 * s * s))
 
-        self.Y[self.mask] = self.Y[self.mask] + bump[self.mask]
+        # Masked in-place add: no gather/scatter temporaries
+        np.add(self.Y, bump, out=self.Y, where=self.mask)
 
     def normalize(self) -> None:
         """
         Shift heights so the minimum inside the green is 0 ft.
         """
         min_y = np.nanmin(self.Y)
-        self.Y[self.mask] = self.Y[self.mask] - min_y
+        np.subtract(self.Y, min_y, out=self.Y, where=self.mask)
 
     def compute_gradients(self) -> None:
         """
         Compute dY/dX and dY/dZ in (ft/ft). Ignores NaNs safely.
+        Gradients keep the dtype of Y (float32 heightfields give float32 gradients)
+        and are always fresh C-contiguous arrays, whatever the memory order of Y.
         """
         # Fill NaNs with nearest-ish values so gradient doesn't explode at edges.
         # Simple approach: copy Y then set outside to 0 before gradient, then mask afterwards.
         Y_filled = np.where(self.mask, self.Y, 0.0)
-
-        dZ, dX = np.gradient(Y_filled, self.resolution_ft, self.resolution_ft)
+        inv_2h = 0.5 / self.resolution_ft
+        inv_h = 1.0 / self.resolution_ft
+
+        # Same stencil as np.gradient: central differences inside, one-sided at
+        # the edges, written straight into the output buffers.
+        dX = np.empty(Y_filled.shape, dtype=Y_filled.dtype)
+        np.subtract(Y_filled[:, 2:], Y_filled[:, :-2], out=dX[:, 1:-1])
+        dX[:, 1:-1] *= inv_2h
+        dX[:, 0] = (Y_filled[:, 1] - Y_filled[:, 0]) * inv_h
+        dX[:, -1] = (Y_filled[:, -1] - Y_filled[:, -2]) * inv_h
+
+        dZ = np.empty(Y_filled.shape, dtype=Y_filled.dtype)
+        np.subtract(Y_filled[2:, :], Y_filled[:-2, :], out=dZ[1:-1, :])
+        dZ[1:-1, :] *= inv_2h
+        dZ[0, :] = (Y_filled[1, :] - Y_filled[0, :]) * inv_h
+        dZ[-1, :] = (Y_filled[-1, :] - Y_filled[-2, :]) * inv_h
 
         # Mask-out gradients outside green
-        dX = np.where(self.mask, dX, np.nan)
-        dZ = np.where(self.mask, dZ, np.nan)
+        outside = ~self.mask
+        dX[outside] = np.nan
+        dZ[outside] = np.nan
 
         self.grad_x = dX
         self.grad_z = dZ
-        self.slope = np.sqrt(dX**2 + dZ**2)
+        self.slope = np.hypot(dX, dZ)
 
     def _index_of(self, x_ft: float, z_ft: float) -> tuple[int, int]:
         """
         Map (x,z) to nearest grid indices (iz, ix).
-        Assumes grid is centered and uniformly spaced.
+        Assumes grid is uniformly spaced.
         """
-        # X and Z are meshgrids made from 1D arrays; grab axis vectors:
-        x_axis = self.X[0, :]
-        z_axis = self.Z[:, 0]
-
-        ix = int(np.clip(np.searchsorted(x_axis, x_ft) - 1, 0, len(x_axis) - 1))
-        iz = int(np.clip(np.searchsorted(z_axis, z_ft) - 1, 0, len(z_axis) - 1))
-        return iz, ix
+        # ceil(...) - 1 picks the same cell as searchsorted(axis, v) - 1
+        nz, nx = self.Y.shape
+        ix = math.ceil((x_ft - self.x_min_ft) / self.resolution_ft) - 1
+        iz = math.ceil((z_ft - self.z_min_ft) / self.resolution_ft) - 1
+        return max(0, min(nz - 1, iz)), max(0, min(nx - 1, ix))
 
     def get_height_at(self, x_ft: float, z_ft: float) -> float:
         iz, ix = self._index_of(x_ft, z_ft)
@@ -124,3 +173,26 @@ class HeightMap:
 
         iz, ix = self._index_of(x_ft, z_ft)
         return np.array([self.grad_x[iz, ix], self.grad_z[iz, ix]], dtype=float)
+
+    def _index_of_batch(self, x_ft: np.ndarray, z_ft: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized _index_of: map arrays of (x,z) to grid indices (iz, ix).
+        """
+        nz, nx = self.Y.shape
+        ix = np.ceil((x_ft - self.x_min_ft) / self.resolution_ft).astype(np.intp) - 1
+        iz = np.ceil((z_ft - self.z_min_ft) / self.resolution_ft).astype(np.intp) - 1
+        return np.clip(iz, 0, nz - 1), np.clip(ix, 0, nx - 1)
+
+    def get_height_at_batch(self, x_ft: np.ndarray, z_ft: np.ndarray) -> np.ndarray:
+        iz, ix = self._index_of_batch(np.asarray(x_ft), np.asarray(z_ft))
+        return self.Y[iz, ix]
+
+    def get_gradient_at_batch(self, x_ft: np.ndarray, z_ft: np.ndarray) -> np.ndarray:
+        """
+        Returns (..., 2) array of [dY/dX, dY/dZ] per query point.
+        """
+        if self.grad_x is None or self.grad_z is None:
+            raise RuntimeError("Gradients not computed yet. Call compute_gradients().")
+
+        iz, ix = self._index_of_batch(np.asarray(x_ft), np.asarray(z_ft))
+        return np.stack([self.grad_x[iz, ix], self.grad_z[iz, ix]], axis=-1).astype(float, copy=False)
@@ -2,6 +2,8 @@ import json
 import os
 import sys
 import numpy as np
+import orjson
+import shapely
 from shapely.geometry import Polygon
 
 from backend.maps import GreenExtentsLatLon, infer_green_size_ft
@@ -9,15 +11,15 @@ from backend.maps.green_map_scale import make_local_grid_ft
 from backend.terrain.contour_reconstruct import reconstruct_heightfield_from_contours
 from backend.tools.paths import (
     config_path, boundary_path, contours_path,
-    unity_dir, heightfield_bin_path, heightfield_json_path,
+    unity_dir, rbf_cache_dir, heightfield_bin_path, heightfield_json_path,
 )
 
 
 def main(course_name: str, hole_name: str):
     # Load config
     cfg_file = config_path(course_name, hole_name)
-    with open(cfg_file, "r") as f:
-        cfg = json.load(f)
+    with open(cfg_file, "rb") as f:
+        cfg = orjson.loads(f.read())
 
     e = cfg["extents"]
     extents = GreenExtentsLatLon(
@@ -30,18 +32,21 @@ def main(course_name: str, hole_name: str):
 
     # Load boundary
     bnd_file = boundary_path(course_name, hole_name)
-    with open(bnd_file, "r") as f:
-        b = json.load(f)
-    boundary_poly = Polygon([(p["x"], p["z"]) for p in b["points_xz_ft"]])
+    with open(bnd_file, "rb") as f:
+        b = orjson.loads(f.read())
+    ring = np.array([(p["x"], p["z"]) for p in b["points_xz_ft"]], dtype=np.float64)
+    boundary_poly = Polygon(ring)  # (N, 2) array goes straight to GEOS
+    shapely.prepare(boundary_poly)
 
     # Load contours
     ctr_file = contours_path(course_name, hole_name)
-    with open(ctr_file, "r") as f:
-        c = json.load(f)
+    with open(ctr_file, "rb") as f:
+        c = orjson.loads(f.read())
 
     contours_in = []
     for item in c["contours"]:
-        pts = [(p["x"], p["z"]) for p in item["points_xz_ft"]]
+        # (N, 2) float64 per contour; sample_polyline consumes it without conversion
+        pts = np.array([(p["x"], p["z"]) for p in item["points_xz_ft"]], dtype=np.float64)
         contours_in.append({"height_ft": float(item["height_ft"]), "points_xz": pts})
 
     # Reconstruct heightfield
@@ -55,9 +60,12 @@ def main(course_name: str, hole_name: str):
         grid_z=Z,
         sample_step_ft=1.0,
         smooth=0.25,
+        dtype=np.float32,
+        cache_dir=rbf_cache_dir(course_name, hole_name),
     )
 
-    Y_filled = np.nan_to_num(Y, nan=0.0).astype(np.float32)
+    # Unity reads raw row-major float32: guarantee C order (no copy when it already is)
+    Y_filled = np.ascontiguousarray(np.nan_to_num(Y, copy=False, nan=0.0), dtype=np.float32)
 
     # Write outputs
     out_dir = unity_dir(course_name, hole_name)
@@ -1,6 +1,12 @@
-"""Centralized path resolution for course/hole resources."""
+"""Centralized path resolution for course/hole resources.
+
+Per-hole helpers are pure string joins, memoized so bulk builds/exports
+resolve each path once. They return str (callers compare against scandir paths).
+"""
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 
 _RESOURCES_ROOT = os.path.join("backend", "resources", "greenMaps")
 
@@ -9,37 +15,84 @@ def course_dir(course_name: str) -> str:
     return os.path.join(_RESOURCES_ROOT, course_name)
 
 
+@lru_cache(maxsize=256)
 def hole_dir(course_name: str, hole_name: str) -> str:
     return os.path.join(_RESOURCES_ROOT, course_name, hole_name)
 
 
+@lru_cache(maxsize=256)
 def config_path(course_name: str, hole_name: str) -> str:
     return os.path.join(hole_dir(course_name, hole_name), "config.json")
 
 
+@lru_cache(maxsize=256)
 def contour_path(course_name: str, hole_name: str) -> str:
     return os.path.join(hole_dir(course_name, hole_name), f"{hole_name}_contour.png")
 
 
+@lru_cache(maxsize=256)
 def map_path(course_name: str, hole_name: str) -> str:
     return os.path.join(hole_dir(course_name, hole_name), f"{hole_name}_map.png")
 
 
+@lru_cache(maxsize=256)
 def boundary_path(course_name: str, hole_name: str) -> str:
     return os.path.join(hole_dir(course_name, hole_name), f"{hole_name}_boundary.json")
 
 
+@lru_cache(maxsize=256)
 def contours_path(course_name: str, hole_name: str) -> str:
     return os.path.join(hole_dir(course_name, hole_name), f"{hole_name}_contours.json")
 
 
+@lru_cache(maxsize=256)
 def unity_dir(course_name: str, hole_name: str) -> str:
     return os.path.join(hole_dir(course_name, hole_name), "unity")
 
 
+@lru_cache(maxsize=256)
+def rbf_cache_dir(course_name: str, hole_name: str) -> str:
+    """Fitted-RBF pickles; local-only build cache, never uploaded (cleared by build --force)."""
+    return os.path.join(hole_dir(course_name, hole_name), ".cache", "rbf")
+
+
+@lru_cache(maxsize=256)
 def heightfield_bin_path(course_name: str, hole_name: str) -> str:
     return os.path.join(unity_dir(course_name, hole_name), f"{hole_name}_heightfield.bin")
 
 
+@lru_cache(maxsize=256)
 def heightfield_json_path(course_name: str, hole_name: str) -> str:
     return os.path.join(unity_dir(course_name, hole_name), f"{hole_name}_heightfield.json")
+
+
+@dataclass(frozen=True)
+class HolePaths:
+    """All resource paths for one hole, resolved once."""
+
+    hole_dir: str
+    unity_dir: str
+    rbf_cache: str
+    config: str
+    contour: str
+    map: str
+    boundary: str
+    contours: str
+    heightfield_bin: str
+    heightfield_json: str
+
+
+@lru_cache(maxsize=None)
+def hole_paths(course_name: str, hole_name: str) -> HolePaths:
+    return HolePaths(
+        hole_dir=hole_dir(course_name, hole_name),
+        unity_dir=unity_dir(course_name, hole_name),
+        rbf_cache=rbf_cache_dir(course_name, hole_name),
+        config=config_path(course_name, hole_name),
+        contour=contour_path(course_name, hole_name),
+        map=map_path(course_name, hole_name),
+        boundary=boundary_path(course_name, hole_name),
+        contours=contours_path(course_name, hole_name),
+        heightfield_bin=heightfield_bin_path(course_name, hole_name),
+        heightfield_json=heightfield_json_path(course_name, hole_name),
+    )
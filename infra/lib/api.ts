@@ -8,7 +8,11 @@ import {
   LayerVersion,
   Tracing,
   Architecture,
+  StartingPosition,
+  FilterCriteria,
+  FilterRule,
 } from "aws-cdk-lib/aws-lambda";
+import { DynamoEventSource } from "aws-cdk-lib/aws-lambda-event-sources";
 import {
   RestApi,
   Cors,
@@ -32,16 +36,31 @@ export interface ApiConstructProps {
 // Project root relative to this file (infra/lib/) -> ../../
 const PROJECT_ROOT = join(__dirname, "../..");
 
+// Local build artifacts that must not ship in (or re-hash) Lambda assets
+const ASSET_EXCLUDES = ["**/__pycache__", "**/*.pyc"];
+
 export class ApiConstruct extends Construct {
   public readonly api: RestApi;
 
   constructor(scope: Construct, id: string, props: ApiConstructProps) {
     super(scope, id);
 
-    // Shared Lambda layer (db, s3, response helpers)
+    // Shared Lambda layer (db, s3, response helpers) + orjson, installed via Docker
     const sharedLayer = new LayerVersion(this, "SharedLayer", {
       layerVersionName: LAYER_NAME,
-      code: Code.fromAsset(join(PROJECT_ROOT, "lambdas/layer")),
+      code: Code.fromAsset(join(PROJECT_ROOT, "lambdas/layer"), {
+        exclude: ASSET_EXCLUDES,
+        bundling: {
+          image: Runtime.PYTHON_3_12.bundlingImage,
+          command: [
+            "bash", "-c",
+            [
+              "pip install orjson -t /asset-output/python",
+              "cp -r python/shared /asset-output/python/",
+            ].join(" && "),
+          ],
+        },
+      }),
       compatibleRuntimes: [Runtime.PYTHON_3_12],
       description: "Shared utilities for GreenReader lambdas",
     });
@@ -54,14 +73,16 @@ export class ApiConstruct extends Construct {
       LOG_LEVEL: "INFO",
     };
 
-    // Helper to create a lightweight Lambda (API/CRUD handlers)
-    const makeFn = (name: string, functionName: string, handlerDir: string): LambdaFunction => {
-      const fn = new LambdaFunction(this, name, {
+    // Helper to create a lightweight API Lambda: one handler's index.py plus the
+    // shared layer. Local bytecode caches stay out of the deployment package.
+    const makeHandlerFn = (name: string, functionName: string, handlerDir: string): LambdaFunction =>
+      new LambdaFunction(this, name, {
         functionName,
         runtime: Runtime.PYTHON_3_12,
         handler: "index.handler",
         code: Code.fromAsset(
-          join(PROJECT_ROOT, `lambdas/handlers/${handlerDir}`)
+          join(PROJECT_ROOT, `lambdas/handlers/${handlerDir}`),
+          { exclude: ASSET_EXCLUDES }
         ),
         layers: [sharedLayer],
         environment: commonEnv,
@@ -72,6 +93,10 @@ export class ApiConstruct extends Construct {
         }),
         tracing: Tracing.ACTIVE,
       });
+
+    // CRUD handlers get the catalog table and bucket
+    const makeFn = (name: string, functionName: string, handlerDir: string): LambdaFunction => {
+      const fn = makeHandlerFn(name, functionName, handlerDir);
       props.table.grantReadWriteData(fn);
       props.bucket.grantReadWrite(fn);
       return fn;
@@ -84,36 +109,17 @@ export class ApiConstruct extends Construct {
     const getHoleFn = makeFn("GetHole", LAMBDA_NAMES.getHole, "get_hole");
     const registerHoleFn = makeFn("RegisterHole", LAMBDA_NAMES.registerHole, "register_hole");
     const updateHoleFn = makeFn("UpdateHole", LAMBDA_NAMES.updateHole, "update_hole");
-    // Helper for thin bestline API handlers (not created via makeFn — no catalog table access needed)
-    const makeBestlineFn = (name: string, functionName: string, handlerDir: string): LambdaFunction => {
-      const fn = new LambdaFunction(this, name, {
-        functionName,
-        runtime: Runtime.PYTHON_3_12,
-        handler: "index.handler",
-        code: Code.fromAsset(
-          join(PROJECT_ROOT, `lambdas/handlers/${handlerDir}`)
-        ),
-        layers: [sharedLayer],
-        environment: commonEnv,
-        architecture: Architecture.ARM_64,
-        timeout: Duration.seconds(10),
-        logGroup: new LogGroup(this, `${name}Logs`, {
-          retention: RetentionDays.TWO_WEEKS,
-        }),
-        tracing: Tracing.ACTIVE,
-      });
-      return fn;
-    };
 
-    const submitBestlineFn = makeBestlineFn("SubmitBestline", LAMBDA_NAMES.submitBestline, "submit_bestline");
+    // Thin bestline API handlers: no catalog table access, grants are per function
+    const submitBestlineFn = makeHandlerFn("SubmitBestline", LAMBDA_NAMES.submitBestline, "submit_bestline");
     props.jobTable.grantReadWriteData(submitBestlineFn);
     props.bucket.grantRead(submitBestlineFn);
 
-    const getBestlineFn = makeBestlineFn("GetBestline", LAMBDA_NAMES.getBestline, "get_bestline");
+    const getBestlineFn = makeHandlerFn("GetBestline", LAMBDA_NAMES.getBestline, "get_bestline");
     props.jobTable.grantReadWriteData(getBestlineFn);
     props.bucket.grantRead(getBestlineFn);
 
-    // Compute Lambda — bundles numpy + backend physics/terrain modules via Docker
+    // Compute Lambda — bundles numpy/numba/orjson + backend physics/terrain modules via Docker
     const computeBestlineFn = new LambdaFunction(this, "ComputeBestline", {
       functionName: LAMBDA_NAMES.computeBestline,
       runtime: Runtime.PYTHON_3_12,
@@ -124,18 +130,25 @@ export class ApiConstruct extends Construct {
           command: [
             "bash", "-c",
             [
-              "pip install numpy -t /asset-output",
+              "pip install numpy numba orjson -t /asset-output",
               "cp lambdas/handlers/compute_bestline/index.py /asset-output/",
               "mkdir -p /asset-output/terrain /asset-output/physics",
-              "cp backend/terrain/__init__.py backend/terrain/heightmap.py backend/terrain/green.py /asset-output/terrain/",
-              "cp backend/physics/__init__.py backend/physics/ball_roll_stimp.py backend/physics/best_line_refine.py /asset-output/physics/",
+              "cp backend/terrain/__init__.py backend/terrain/_grad_numba.py backend/terrain/heightmap.py backend/terrain/green.py /asset-output/terrain/",
+              "cp backend/physics/__init__.py backend/physics/_roll_numba.py backend/physics/ball_roll_stimp.py backend/physics/best_line_refine.py /asset-output/physics/",
             ].join(" && "),
           ],
         },
       }),
       layers: [sharedLayer],
-      environment: commonEnv,
+      environment: {
+        ...commonEnv,
+        // /var/task is read-only; numba's cache=True kernels need a writable cache dir
+        // so warm containers load compiled code instead of re-JITting.
+        NUMBA_CACHE_DIR: "/tmp/numba_cache",
+      },
       architecture: Architecture.ARM_64,
+      // vCPUs scale with memory (~1 per 1769 MB); the coarse best-line grid is a
+      // numba prange sweep, so it spreads across every core this buys.
       memorySize: 3008,
       timeout: Duration.seconds(180),
       logGroup: new LogGroup(this, "ComputeBestlineLogs", {
@@ -146,9 +159,19 @@ export class ApiConstruct extends Construct {
     props.bucket.grantReadWrite(computeBestlineFn);
     props.jobTable.grantReadWriteData(computeBestlineFn);
 
-    computeBestlineFn.grantInvoke(submitBestlineFn);
-
-    submitBestlineFn.addEnvironment("COMPUTE_BESTLINE_FUNCTION", computeBestlineFn.functionName);
+    // Submit only writes the job row; its stream INSERT (status=queued) starts the
+    // compute Lambda, one job per batch. Status updates are MODIFYs and are filtered out.
+    computeBestlineFn.addEventSource(new DynamoEventSource(props.jobTable, {
+      startingPosition: StartingPosition.LATEST,
+      batchSize: 1,
+      retryAttempts: 2,
+      filters: [
+        FilterCriteria.filter({
+          eventName: FilterRule.isEqual("INSERT"),
+          dynamodb: { NewImage: { status: { S: FilterRule.isEqual("queued") } } },
+        }),
+      ],
+    }));
 
     // API Gateway access logs
     const apiLogGroup = new LogGroup(this, "ApiAccessLogs", {
@@ -10,6 +10,7 @@ import {
   Table,
   AttributeType,
   BillingMode,
+  StreamViewType,
 } from "aws-cdk-lib/aws-dynamodb";
 import { BUCKET_NAME, TABLE_NAME, JOB_TABLE_NAME } from "./constants";
 
@@ -50,6 +51,8 @@ export class StorageConstruct extends Construct {
       billingMode: BillingMode.PAY_PER_REQUEST,
       removalPolicy: RemovalPolicy.DESTROY,
       timeToLiveAttribute: "ttl",
+      // Inserted jobs trigger the compute Lambda (see ApiConstruct)
+      stream: StreamViewType.NEW_IMAGE,
     });
 
     this.table.addGlobalSecondaryIndex({
@@ -1,49 +1,68 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-import boto3
 import numpy as np
+import orjson
+from boto3.dynamodb.types import TypeDeserializer
 
-from terrain.heightmap import HeightMap
-from physics.ball_roll_stimp import BallRollSimulatorStimp
-from physics.best_line_refine import best_line_coarse_to_fine
-
-from shared.db import get_job_table, to_dynamo, bestline_job_key
+from shared.db import bestline_job_key, update_job
 from shared.log import get_logger
-from shared.s3 import get_bucket
+from shared.s3 import get_bucket, get_client
 
 logger = get_logger(__name__)
 
-s3 = boto3.client("s3")
+s3 = get_client()
+_s3_pool = ThreadPoolExecutor(max_workers=4)  # boto3 clients are safe to share across threads
+_deserializer = TypeDeserializer()
 
 DEFAULT_STIMP_FT = 10.0
+_POSITION_FIELDS = ("ballXFt", "ballZFt", "holeXFt", "holeZFt")
+
+# Warm containers keep recently used heightmaps (with gradients), keyed by
+# (course_id, hole_num, heightfield.bin + heightfield.json ETags) so re-uploading
+# either file invalidates them.
+_HM_CACHE_SIZE = 4
+_hm_cache = {}  # (course_id, hole_num, etag) -> HeightMap
 
 
 def _now_iso():
     return datetime.now(timezone.utc).isoformat()
 
 
+def _update_template(fields):
+    """(fields, UpdateExpression, ExpressionAttributeNames, value placeholders) for a field order."""
+    value_keys = tuple(f":v{idx}" for idx in range(len(fields)))
+    update_expr = "SET " + ", ".join(f"#k{idx} = {vk}" for idx, vk in enumerate(value_keys))
+    expr_names = {f"#k{idx}": key for idx, key in enumerate(fields)}
+    return fields, update_expr, expr_names, value_keys
+
+
+# The handler's job updates, prebuilt; anything else falls back to _update_template.
+_UPDATE_TEMPLATES = {
+    frozenset(fields): _update_template(fields)
+    for fields in (
+        ("status", "error", "updatedAt"),
+        ("status", "startedAt", "updatedAt"),
+        ("status", "completedAt", "resultKey", "cacheKey", "updatedAt"),
+    )
+}
+
+
 def _update_job(course_id, hole_num, job_id, updates):
     if not job_id:
         return
     try:
-        table = get_job_table()
         updates = {**updates, "updatedAt": _now_iso()}
-        update_expr_parts = []
-        expr_names = {}
-        expr_values = {}
-        for idx, (key, value) in enumerate(updates.items()):
-            name_key = f"#k{idx}"
-            value_key = f":v{idx}"
-            update_expr_parts.append(f"{name_key} = {value_key}")
-            expr_names[name_key] = key
-            expr_values[value_key] = to_dynamo(value)
-
-        table.update_item(
-            Key=bestline_job_key(course_id, hole_num, job_id),
-            UpdateExpression="SET " + ", ".join(update_expr_parts),
-            ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_values,
+        template = _UPDATE_TEMPLATES.get(frozenset(updates))
+        if template is None:
+            template = _update_template(tuple(updates))
+        fields, update_expr, expr_names, value_keys = template
+
+        update_job(
+            bestline_job_key(course_id, hole_num, job_id),
+            update_expr,
+            expr_names,
+            {vk: updates[key] for key, vk in zip(fields, value_keys)},
         )
     except Exception:
         logger.exception(
@@ -52,14 +71,54 @@ def _update_job(course_id, hole_num, job_id, updates):
         )
 
 
+def _read_into(body, out):
+    """Fill the C-contiguous array `out` straight from an S3 StreamingBody (no bytes copy)."""
+    view = memoryview(out).cast("B")
+    readinto = getattr(body, "readinto", None)
+    if readinto is None:  # older botocore without StreamingBody.readinto
+        view[:] = body.read()
+        return
+    n = 0
+    while n < len(view):
+        got = readinto(view[n:])
+        if not got:
+            raise ValueError(f"heightfield.bin truncated: got {n} of {len(view)} bytes")
+        n += got
+
+
 def _load_heightmap(course_id, hole_num):
-    """Download heightfield.json + heightfield.bin from S3 and reconstruct a HeightMap."""
+    """Return the hole's HeightMap, from the warm cache when both S3 ETags still match."""
     bucket = get_bucket()
     prefix = f"{course_id}/{hole_num}/processed"
 
-    logger.info("Loading heightfield metadata from S3: %s/heightfield.json", prefix)
+    # The grid comes from the .bin, its origin/resolution from the .json: key on both.
+    # The two HEADs run concurrently.
+    bin_future = _s3_pool.submit(s3.head_object, Bucket=bucket, Key=f"{prefix}/heightfield.bin")
+    json_etag = s3.head_object(Bucket=bucket, Key=f"{prefix}/heightfield.json")["ETag"]
+    etag = f"{bin_future.result()['ETag']}:{json_etag}"
+    key = (course_id, hole_num, etag)
+
+    hm = _hm_cache.pop(key, None)
+    if hm is not None:
+        logger.info("Heightmap cache hit: %s (%s)", prefix, etag)
+    else:
+        hm = _fetch_heightmap(bucket, prefix)
+    if len(_hm_cache) >= _HM_CACHE_SIZE:
+        _hm_cache.pop(next(iter(_hm_cache)))  # evict least recently used
+    _hm_cache[key] = hm
+    return hm
+
+
+def _fetch_heightmap(bucket, prefix):
+    """Download heightfield.json + heightfield.bin from S3 and reconstruct a HeightMap."""
+    # terrain/physics pull in numba; they are imported on first use, not at init
+    from terrain.heightmap import HeightMap
+
+    # Start the binary GET first so it is in flight while the metadata is fetched and parsed
+    logger.info("Loading heightfield from S3: %s/heightfield.{json,bin}", prefix)
+    bin_future = _s3_pool.submit(s3.get_object, Bucket=bucket, Key=f"{prefix}/heightfield.bin")
     meta_obj = s3.get_object(Bucket=bucket, Key=f"{prefix}/heightfield.json")
-    meta = json.loads(meta_obj["Body"].read())
+    meta = orjson.loads(meta_obj["Body"].read())
 
     grid = meta["grid"]
     nx = grid["nx"]
@@ -68,49 +127,47 @@ def _load_heightmap(course_id, hole_num):
     x_min = grid["x_min_ft"]
     z_min = grid["z_min_ft"]
 
-    logger.info("Loading heightfield binary from S3: %s/heightfield.bin", prefix)
-    bin_obj = s3.get_object(Bucket=bucket, Key=f"{prefix}/heightfield.bin")
-    raw = bin_obj["Body"].read()
-    Y = np.frombuffer(raw, dtype=np.float32).reshape((nz, nx))
+    bin_obj = bin_future.result()
+    Y = np.empty((nz, nx), dtype=np.float32)
+    if bin_obj["ContentLength"] != Y.nbytes:
+        raise ValueError(
+            f"heightfield.bin is {bin_obj['ContentLength']} bytes, expected {Y.nbytes} for a {nz}x{nx} grid"
+        )
+    _read_into(bin_obj["Body"], Y)
 
-    x_axis = np.arange(nx) * res + x_min
-    z_axis = np.arange(nz) * res + z_min
-    X, Z = np.meshgrid(x_axis, z_axis)
+    # Mask + float32 gradients in one fused pass over the on-disk buffer
+    return HeightMap.from_buffer(Y, res, x_min, z_min)
 
-    mask = Y > 0.0
 
-    hm = HeightMap(X=X, Z=Z, Y=Y.astype(np.float64), resolution_ft=res, mask=mask)
-    hm.compute_gradients()
-
-    return hm
+def _parse_params(params):
+    """(ball_x, ball_z, hole_x, hole_z, stimp_ft) as floats, or None if a position is missing."""
+    values = [params.get(field) for field in _POSITION_FIELDS]
+    if any(v is None for v in values):
+        return None
+    values.append(params.get("stimpFt", DEFAULT_STIMP_FT))
+    # JSON numbers mostly arrive as floats already; only convert the rest (ints, strings)
+    return tuple(v if type(v) is float else float(v) for v in values)
 
 
 def handler(event, context):
-    job = event["job"]
+    # The job table stream (batchSize 1, INSERTs only) delivers the job row itself;
+    # a direct invoke passes {"job": ...} as-is
+    if "Records" in event:
+        job = _deserializer.deserialize({"M": event["Records"][0]["dynamodb"]["NewImage"]})
+    else:
+        job = event["job"]
     job_id = job.get("jobId")
     course_id = job["courseId"]
-    hole_num = job["holeNum"]
+    hole_num = str(job["holeNum"])  # a Decimal when read from the stream
     ctx = {"course_id": course_id, "hole_num": hole_num, "job_id": job_id}
     logger.info("Computing bestline job", extra=ctx)
 
     try:
-        body = job.get("params") or {}
-
-        ball_x = body.get("ballXFt")
-        ball_z = body.get("ballZFt")
-        hole_x = body.get("holeXFt")
-        hole_z = body.get("holeZFt")
-        if ball_x is None or ball_z is None or hole_x is None or hole_z is None:
+        params = _parse_params(job.get("params") or {})
+        if params is None:
             _update_job(course_id, hole_num, job_id, {"status": "failed", "error": "Missing required position fields"})
             return {"status": "error"}
-
-        stimp_ft = body.get("stimpFt", DEFAULT_STIMP_FT)
-
-        ball_x = float(ball_x)
-        ball_z = float(ball_z)
-        hole_x = float(hole_x)
-        hole_z = float(hole_z)
-        stimp_ft = float(stimp_ft)
+        ball_x, ball_z, hole_x, hole_z, stimp_ft = params
 
         # Load heightfield from S3
         try:
@@ -123,6 +180,9 @@ def handler(event, context):
         # Run simulation
         _update_job(course_id, hole_num, job_id, {"status": "running", "startedAt": _now_iso()})
 
+        from physics.ball_roll_stimp import BallRollSimulatorStimp
+        from physics.best_line_refine import best_line_coarse_to_fine
+
         logger.info("Running simulation: ball=(%.2f, %.2f) hole=(%.2f, %.2f) stimp=%.1f",
                      ball_x, ball_z, hole_x, hole_z, stimp_ft, extra=ctx)
         sim = BallRollSimulatorStimp(hm, stimp_ft=stimp_ft)
@@ -149,9 +209,10 @@ def handler(event, context):
             "holed": res["holed"],
             "missFt": result["miss_ft"],
             "tEndS": res["t_end"],
-            "pathXFt": res["path_x"].tolist(),
-            "pathZFt": res["path_z"].tolist(),
-            "pathYFt": res["path_y"].tolist(),
+            # float32 ndarrays; orjson serializes them directly (no .tolist())
+            "pathXFt": res["path_x"],
+            "pathZFt": res["path_z"],
+            "pathYFt": res["path_y"],
         }
 
         logger.info("Bestline computed: holed=%s miss_ft=%.3f", res["holed"], result["miss_ft"], extra=ctx)
@@ -161,8 +222,10 @@ def handler(event, context):
             s3.put_object(
                 Bucket=get_bucket(),
                 Key=result_key,
-                Body=json.dumps({"bestLine": bestline}).encode("utf-8"),
+                Body=orjson.dumps({"bestLine": bestline}, option=orjson.OPT_SERIALIZE_NUMPY),
                 ContentType="application/json",
+                # submit_bestline validates older cached results against this
+                Metadata={"heightfield-etag": job.get("heightfieldEtag") or ""},
             )
         _update_job(
             course_id,
@@ -1,4 +1,4 @@
-import json
+import orjson
 
 from shared.db import get_table, to_dynamo
 from shared.log import get_logger
@@ -12,8 +12,8 @@ def handler(event, context):
 
     try:
         try:
-            body = json.loads(event.get("body", "{}"))
-        except json.JSONDecodeError:
+            body = orjson.loads(event.get("body", "{}"))
+        except orjson.JSONDecodeError:
             return error("Invalid JSON body")
 
         course_id = body.get("id")
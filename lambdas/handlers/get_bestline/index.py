@@ -1,17 +1,15 @@
-import json
 from datetime import datetime, timezone
 
-import boto3
 from botocore.exceptions import ClientError
 
 from shared.db import get_job_table, bestline_job_key
 from shared.log import get_logger
-from shared.response import error, success
-from shared.s3 import get_bucket
+from shared.response import error, raw_success, success
+from shared.s3 import get_bucket, get_client
 
 logger = get_logger(__name__)
 
-s3 = boto3.client("s3")
+s3 = get_client()
 STALE_JOB_SECONDS = 300
 
 
@@ -37,8 +35,8 @@ def handler(event, context):
                 return error("Bestline result missing", 500)
             try:
                 cached = s3.get_object(Bucket=get_bucket(), Key=result_key)
-                cached_body = cached["Body"].read()
-                return success(json.loads(cached_body))
+                # Stored results are already JSON; hand them back without a parse/dump round trip
+                return raw_success(cached["Body"].read())
             except ClientError:
                 logger.exception("Failed to read cached result", extra=ctx)
                 return error("Failed to load bestline result", 500)
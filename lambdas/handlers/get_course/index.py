@@ -1,3 +1,5 @@
+from operator import itemgetter
+
 from shared.db import get_table
 from shared.log import get_logger
 from shared.response import error, success
@@ -23,35 +25,43 @@ def handler(event, context):
             logger.info("Course not found", extra=ctx)
             return error("Course not found", 404)
 
-        course = None
-        holes = []
-
+        # Course partitions hold one META item plus one HOLE#nn item per hole
+        meta = None
+        hole_items = []
         for item in items:
-            if item["sk"] == "META":
-                course = {
-                    "id": item["courseId"],
-                    "name": item["name"],
-                    "city": item.get("city"),
-                    "state": item.get("state"),
-                    "location": item.get("location"),
-                    "numHoles": item.get("numHoles"),
-                }
-            elif item["sk"].startswith("HOLE#"):
-                holes.append(
-                    {
-                        "holeNum": item["holeNum"],
-                        "greenWidthFt": item.get("greenWidthFt"),
-                        "greenHeightFt": item.get("greenHeightFt"),
-                        "hasSource": item.get("hasSource", False),
-                        "hasProcessed": item.get("hasProcessed", False),
-                    }
-                )
-
-        if course is None:
+            sk = item["sk"]
+            if sk == "META":
+                meta = item
+            elif sk.startswith("HOLE#"):
+                hole_items.append(item)
+
+        if meta is None:
             logger.info("Course META not found", extra=ctx)
             return error("Course not found", 404)
 
-        course["holes"] = sorted(holes, key=lambda h: h["holeNum"])
+        course = {
+            "id": meta["courseId"],
+            "name": meta["name"],
+            "city": meta.get("city"),
+            "state": meta.get("state"),
+            "location": meta.get("location"),
+            "numHoles": meta.get("numHoles"),
+        }
+        holes = sorted(
+            (
+                {
+                    "holeNum": item["holeNum"],
+                    "greenWidthFt": item.get("greenWidthFt"),
+                    "greenHeightFt": item.get("greenHeightFt"),
+                    "hasSource": item.get("hasSource", False),
+                    "hasProcessed": item.get("hasProcessed", False),
+                }
+                for item in hole_items
+            ),
+            key=itemgetter("holeNum"),
+        )
+
+        course["holes"] = holes
         logger.info("Course retrieved with %d holes", len(holes), extra=ctx)
         return success({"course": course})
     except Exception:
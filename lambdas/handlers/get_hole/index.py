@@ -1,7 +1,7 @@
 from shared.db import get_table
 from shared.log import get_logger
 from shared.response import error, success
-from shared.s3 import cdn_url
+from shared.s3 import get_cdn_domain
 
 logger = get_logger(__name__)
 
@@ -42,15 +42,14 @@ def handler(event, context):
             "hasProcessed": item.get("hasProcessed", False),
         }
 
+        # Same layout as shared.s3.cdn_url, with the per-hole base built once
+        base = f"https://{get_cdn_domain()}/{s3_prefix}"
+
         if item.get("hasSource"):
-            hole["sourceUrls"] = {
-                f: cdn_url(f"{s3_prefix}/source/{f}") for f in SOURCE_FILES
-            }
+            hole["sourceUrls"] = {f: f"{base}/source/{f}" for f in SOURCE_FILES}
 
         if item.get("hasProcessed"):
-            hole["processedUrls"] = {
-                f: cdn_url(f"{s3_prefix}/processed/{f}") for f in PROCESSED_FILES
-            }
+            hole["processedUrls"] = {f: f"{base}/processed/{f}" for f in PROCESSED_FILES}
 
         logger.info("Hole retrieved", extra=ctx)
         return success({"hole": hole})
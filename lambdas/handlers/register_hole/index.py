@@ -1,4 +1,4 @@
-import json
+import orjson
 
 from shared.db import get_table, to_dynamo
 from shared.log import get_logger
@@ -19,6 +19,12 @@ PROCESSED_FILES = {
     "heightfield.bin": "application/octet-stream",
 }
 
+# (prefix subdir, file name, content type) for every pre-signed upload, in one table
+UPLOAD_FILES = tuple(
+    [("source", name, ct) for name, ct in SOURCE_FILES.items()]
+    + [("processed", name, ct) for name, ct in PROCESSED_FILES.items()]
+)
+
 
 def handler(event, context):
     course_id = event["pathParameters"]["courseId"]
@@ -28,8 +34,8 @@ def handler(event, context):
 
     try:
         try:
-            body = json.loads(event.get("body") or "{}")
-        except json.JSONDecodeError:
+            body = orjson.loads(event.get("body") or "{}")
+        except orjson.JSONDecodeError:
             body = {}
 
         table = get_table()
@@ -50,20 +56,11 @@ def handler(event, context):
 
         table.put_item(Item=to_dynamo(item))
 
-        upload_urls = {
-            "source": {
-                name: presigned_upload_url(
-                    f"{s3_prefix}/source/{name}", content_type=ct
-                )
-                for name, ct in SOURCE_FILES.items()
-            },
-            "processed": {
-                name: presigned_upload_url(
-                    f"{s3_prefix}/processed/{name}", content_type=ct
-                )
-                for name, ct in PROCESSED_FILES.items()
-            },
-        }
+        upload_urls = {"source": {}, "processed": {}}
+        for subdir, name, ct in UPLOAD_FILES:
+            upload_urls[subdir][name] = presigned_upload_url(
+                f"{s3_prefix}/{subdir}/{name}", content_type=ct
+            )
 
         logger.info("Hole registered", extra=ctx)
         return success({"holeNum": int(hole_num), "uploadUrls": upload_urls}, status_code=201)
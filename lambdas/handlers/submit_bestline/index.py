@@ -1,51 +1,105 @@
-import json
+import base64
+import binascii
 import hashlib
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 
-import boto3
+import orjson
 from botocore.exceptions import ClientError
 
-from shared.db import get_job_table, to_dynamo, bestline_job_key
+from shared.db import bestline_job_key, put_job
 from shared.log import get_logger
-from shared.response import error, success
-from shared.s3 import get_bucket
+from shared.response import error, raw_success, success
+from shared.s3 import get_bucket, get_client
 
 logger = get_logger(__name__)
 
-s3 = boto3.client("s3")
-lambda_client = boto3.client("lambda")
+s3 = get_client()
+_s3_pool = ThreadPoolExecutor(max_workers=2)  # boto3 clients are safe to share across threads
 
+MAX_BODY_BYTES = 8192
 DEFAULT_STIMP_FT = 10.0
 JOB_TIMEOUT_SECONDS = 300
 JOB_TTL_SECONDS = 86400  # 24 hours
-
-
-def _now_iso():
-    return datetime.now(timezone.utc).isoformat()
+# Cached results younger than this are served without re-checking the heightfield ETag
+CACHE_TRUST_SECONDS = 300
+# Warm containers reuse a hole's heightfield ETag this long before re-HEADing
+ETAG_TTL_SECONDS = 60
+_ETAG_CACHE_SIZE = 256
+_etag_cache: dict[tuple, tuple[str, float]] = {}
+# Results this container has already downloaded, revalidated with a conditional GET
+_RESULT_CACHE_SIZE = 64
+_result_cache: dict[str, tuple[str, bytes, datetime, dict]] = {}  # key -> (ETag, body, LastModified, Metadata)
 
 
 
 def _heightfield_etag(course_id, hole_num):
+    """'<bin etag>:<json etag>' for the hole's heightfield, reused for ETAG_TTL_SECONDS."""
+    key = (course_id, hole_num)
+    now = time.monotonic()
+    hit = _etag_cache.get(key)
+    if hit is not None and now - hit[1] < ETAG_TTL_SECONDS:
+        return hit[0]
+
     prefix = f"{course_id}/{hole_num}/processed"
     bucket = get_bucket()
-    bin_obj = s3.head_object(Bucket=bucket, Key=f"{prefix}/heightfield.bin")
+    # Both HEADs in flight at once: one round trip instead of two
+    bin_future = _s3_pool.submit(s3.head_object, Bucket=bucket, Key=f"{prefix}/heightfield.bin")
     json_obj = s3.head_object(Bucket=bucket, Key=f"{prefix}/heightfield.json")
+    bin_obj = bin_future.result()
     bin_etag = bin_obj["ETag"].strip('"')
     json_etag = json_obj["ETag"].strip('"')
-    return f"{bin_etag}:{json_etag}"
+    etag = f"{bin_etag}:{json_etag}"
 
+    _etag_cache.pop(key, None)
+    if len(_etag_cache) >= _ETAG_CACHE_SIZE:
+        _etag_cache.pop(next(iter(_etag_cache)))  # evict oldest
+    _etag_cache[key] = (etag, now)
+    return etag
 
-def _cache_key(payload):
-    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"))
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def _cache_key(course_id, hole_num, ball_x, ball_z, hole_x, hole_z, stimp_ft):
+    """Digest of the request's canonical form; floats use repr, so equal inputs always match."""
+    raw = f"{course_id}|{hole_num}|{ball_x!r}|{ball_z!r}|{hole_x!r}|{hole_z!r}|{stimp_ft!r}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
 
 
 def _cache_key_path(course_id, hole_num, cache_key):
     return f"{course_id}/{hole_num}/bestline-cache/{cache_key}.json"
 
 
+def _get_result(result_key):
+    """
+    (body, LastModified, Metadata) of a stored result, or None if there is none.
+
+    A copy held from an earlier call is revalidated with IfNoneMatch, so an
+    unchanged result costs a 304 with no body.
+    """
+    hit = _result_cache.get(result_key)
+    extra = {"IfNoneMatch": hit[0]} if hit is not None else {}
+    try:
+        obj = s3.get_object(Bucket=get_bucket(), Key=result_key, **extra)
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code")
+        if code == "304":
+            _result_cache[result_key] = _result_cache.pop(result_key)  # mark most recent
+            return hit[1:]
+        if code in ("NoSuchKey", "404"):
+            _result_cache.pop(result_key, None)
+            return None
+        raise
+
+    entry = (obj["ETag"], obj["Body"].read(), obj["LastModified"], obj.get("Metadata", {}))
+    _result_cache.pop(result_key, None)
+    if len(_result_cache) >= _RESULT_CACHE_SIZE:
+        _result_cache.pop(next(iter(_result_cache)))  # evict oldest
+    _result_cache[result_key] = entry
+    return entry[1:]
+
+
 def handler(event, context):
     course_id = event["pathParameters"]["courseId"]
     hole_num = event["pathParameters"]["holeNum"]
@@ -53,9 +107,15 @@ def handler(event, context):
     logger.info("Submitting bestline job", extra=ctx)
 
     try:
+        # Bound parse cost: reject oversized bodies before decoding anything
+        raw = event.get("body") or "{}"
+        if len(raw) > MAX_BODY_BYTES:
+            return error("Body too large", 413)
         try:
-            body = json.loads(event.get("body") or "{}")
-        except json.JSONDecodeError:
+            if event.get("isBase64Encoded"):
+                raw = base64.b64decode(raw)
+            body = orjson.loads(raw)
+        except (binascii.Error, orjson.JSONDecodeError):
             return error("Invalid JSON body")
 
         ball_x = body.get("ballXFt")
@@ -67,6 +127,27 @@ def handler(event, context):
 
         stimp_ft = float(body.get("stimpFt", DEFAULT_STIMP_FT))
 
+        # The cache key covers the request only, so a hit costs a single GET. Each result
+        # records the heightfield ETag it was computed from (object metadata); results
+        # older than CACHE_TRUST_SECONDS are checked against the live ETag before use.
+        cache_key = _cache_key(
+            course_id, int(hole_num), float(ball_x), float(ball_z), float(hole_x), float(hole_z), stimp_ft
+        )
+        result_key = _cache_key_path(course_id, hole_num, cache_key)
+
+        try:
+            cached = _get_result(result_key)
+        except ClientError:
+            logger.exception("Failed to read cache", extra=ctx)
+            return error("Failed to read cache", 500)
+
+        if cached is not None:
+            cached_body, last_modified, metadata = cached
+            age_seconds = (datetime.now(timezone.utc) - last_modified).total_seconds()
+            if age_seconds < CACHE_TRUST_SECONDS:
+                # Stored results are already JSON; hand them back without a parse/dump round trip
+                return raw_success(cached_body)
+
         try:
             heightfield_etag = _heightfield_etag(course_id, hole_num)
         except ClientError as exc:
@@ -75,40 +156,24 @@ def handler(event, context):
             logger.exception("Failed to load heightfield metadata", extra=ctx)
             return error("Failed to load heightfield metadata", 500)
 
-        cache_payload = {
-            "courseId": course_id,
-            "holeNum": int(hole_num),
-            "ballXFt": float(ball_x),
-            "ballZFt": float(ball_z),
-            "holeXFt": float(hole_x),
-            "holeZFt": float(hole_z),
-            "stimpFt": stimp_ft,
-            "heightfieldEtag": heightfield_etag,
-        }
-        cache_key = _cache_key(cache_payload)
-        result_key = _cache_key_path(course_id, hole_num, cache_key)
-
-        try:
-            cached = s3.get_object(Bucket=get_bucket(), Key=result_key)
-            cached_body = cached["Body"].read()
-            return success(json.loads(cached_body))
-        except ClientError as exc:
-            if exc.response.get("Error", {}).get("Code") not in ("NoSuchKey", "404"):
-                logger.exception("Failed to read cache", extra=ctx)
-                return error("Failed to read cache", 500)
+        if cached is not None:
+            if metadata.get("heightfield-etag") == heightfield_etag:
+                return raw_success(cached_body)
+            logger.info("Cached bestline predates the current heightfield; recomputing", extra=ctx)
 
         job_id = uuid.uuid4().hex
         now = datetime.now(timezone.utc)
         timeout_at = now + timedelta(seconds=JOB_TIMEOUT_SECONDS)
         ttl_epoch = int((now + timedelta(seconds=JOB_TTL_SECONDS)).timestamp())
+        now_iso = now.isoformat()
         job_item = {
             **bestline_job_key(course_id, hole_num, job_id),
             "jobId": job_id,
             "courseId": course_id,
             "holeNum": int(hole_num),
             "status": "queued",
-            "createdAt": _now_iso(),
-            "updatedAt": _now_iso(),
+            "createdAt": now_iso,
+            "updatedAt": now_iso,
             "timeoutAt": timeout_at.isoformat(),
             "ttl": ttl_epoch,
             "params": {
@@ -122,26 +187,8 @@ def handler(event, context):
             "resultKey": result_key,
             "heightfieldEtag": heightfield_etag,
         }
-        table = get_job_table()
-        table.put_item(Item=to_dynamo(job_item))
-
-        lambda_client.invoke(
-            FunctionName=os.environ["COMPUTE_BESTLINE_FUNCTION"],
-            InvocationType="Event",
-            Payload=json.dumps(
-                {
-                    "job": {
-                        "jobId": job_id,
-                        "courseId": course_id,
-                        "holeNum": hole_num,
-                        "params": job_item["params"],
-                        "cacheKey": cache_key,
-                        "resultKey": result_key,
-                        "heightfieldEtag": heightfield_etag,
-                    }
-                }
-            ).encode("utf-8"),
-        )
+        # The job table stream starts compute_bestline on this INSERT
+        put_job(job_item)
 
         return success({"jobId": job_id, "status": "queued"})
     except Exception:
@@ -1,4 +1,8 @@
-import json
+import base64
+import binascii
+from itertools import combinations
+
+import orjson
 
 from shared.db import get_table, to_dynamo
 from shared.log import get_logger
@@ -6,6 +10,8 @@ from shared.response import error, success
 
 logger = get_logger(__name__)
 
+MAX_BODY_BYTES = 8192
+
 ALLOWED_FIELDS = {
     "hasSource": ":src",
     "hasProcessed": ":proc",
@@ -14,6 +20,13 @@ ALLOWED_FIELDS = {
     "holeXzFt": ":hole",
 }
 
+# UpdateExpression for every non-empty subset of ALLOWED_FIELDS (31 of them), built once
+_UPDATE_EXPRESSIONS = {
+    frozenset(fields): "SET " + ", ".join(f"{field} = {ALLOWED_FIELDS[field]}" for field in fields)
+    for n in range(1, len(ALLOWED_FIELDS) + 1)
+    for fields in combinations(ALLOWED_FIELDS, n)
+}
+
 
 def handler(event, context):
     course_id = event["pathParameters"]["courseId"]
@@ -22,24 +35,22 @@ def handler(event, context):
     logger.info("Updating hole", extra=ctx)
 
     try:
+        # Bound parse cost: reject oversized bodies before decoding anything
+        raw = event.get("body") or "{}"
+        if len(raw) > MAX_BODY_BYTES:
+            return error("Body too large", 413)
         try:
-            body = json.loads(event.get("body") or "{}")
-        except json.JSONDecodeError:
+            if event.get("isBase64Encoded"):
+                raw = base64.b64decode(raw)
+            body = orjson.loads(raw)
+        except (binascii.Error, orjson.JSONDecodeError):
             return error("Invalid JSON body")
 
         if not body:
             return error("Request body is empty")
 
-        # Build update expression from provided fields
-        set_parts = []
-        expr_values = {}
-
-        for field, placeholder in ALLOWED_FIELDS.items():
-            if field in body:
-                set_parts.append(f"{field} = {placeholder}")
-                expr_values[placeholder] = body[field]
-
-        if not set_parts:
+        fields = ALLOWED_FIELDS.keys() & body
+        if not fields:
             return error("No valid fields to update")
 
         table = get_table()
@@ -49,8 +60,8 @@ def handler(event, context):
                 "pk": f"COURSE#{course_id}",
                 "sk": f"HOLE#{hole_num.zfill(2)}",
             },
-            UpdateExpression="SET " + ", ".join(set_parts),
-            ExpressionAttributeValues=to_dynamo(expr_values),
+            UpdateExpression=_UPDATE_EXPRESSIONS[frozenset(fields)],
+            ExpressionAttributeValues=to_dynamo({ALLOWED_FIELDS[field]: body[field] for field in fields}),
             ReturnValues="ALL_NEW",
         )
 
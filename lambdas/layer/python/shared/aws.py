@@ -0,0 +1,12 @@
+_session = None
+
+
+def get_session():
+    """One boto3 Session per container, so clients share its credential/endpoint resolution."""
+    global _session
+    if _session is None:
+        # Deferred so handlers that never reach AWS (or only read env config) skip the SDK import
+        import boto3
+
+        _session = boto3.session.Session()
+    return _session
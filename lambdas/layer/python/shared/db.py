@@ -1,14 +1,18 @@
+import json
+import math
 import os
 from decimal import Decimal
 
-import boto3
+import orjson
 
+from shared.aws import get_session
 from shared.log import get_logger
 
 logger = get_logger(__name__)
 
 _table = None
 _job_table = None
+_client = None
 
 
 def get_table():
@@ -16,7 +20,7 @@ def get_table():
     if _table is None:
         table_name = os.environ["TABLE_NAME"]
         logger.info("Initializing DynamoDB table: %s", table_name)
-        dynamodb = boto3.resource("dynamodb")
+        dynamodb = get_session().resource("dynamodb")
         _table = dynamodb.Table(table_name)
     return _table
 
@@ -26,11 +30,24 @@ def get_job_table():
     if _job_table is None:
         table_name = os.environ["JOB_TABLE_NAME"]
         logger.info("Initializing job DynamoDB table: %s", table_name)
-        dynamodb = boto3.resource("dynamodb")
+        dynamodb = get_session().resource("dynamodb")
         _job_table = dynamodb.Table(table_name)
     return _job_table
 
 
+def get_client():
+    """
+    Low-level DynamoDB client for write-only paths (job put/update).
+
+    Skips the resource layer's model loading and per-call type (de)serializer walk;
+    items are sent as AttributeValue maps built by to_attrs().
+    """
+    global _client
+    if _client is None:
+        _client = get_session().client("dynamodb")
+    return _client
+
+
 def bestline_job_key(course_id, hole_num, job_id):
     hole_key = str(hole_num).zfill(2)
     return {
@@ -39,12 +56,72 @@ def bestline_job_key(course_id, hole_num, job_id):
     }
 
 
-def to_dynamo(obj):
-    """Convert Python floats to Decimal for DynamoDB compatibility."""
+def _to_dynamo_walk(obj):
     if isinstance(obj, float):
         return Decimal(str(obj))
     if isinstance(obj, dict):
-        return {k: to_dynamo(v) for k, v in obj.items()}
+        return {k: _to_dynamo_walk(v) for k, v in obj.items()}
     if isinstance(obj, list):
-        return [to_dynamo(i) for i in obj]
+        return [_to_dynamo_walk(i) for i in obj]
     return obj
+
+
+def to_dynamo(obj):
+    """
+    Convert Python floats to Decimal for DynamoDB compatibility.
+
+    Plain JSON-shaped values take one C-level round trip (orjson out, json with
+    parse_float=Decimal back in); floats keep their shortest repr, exactly as
+    Decimal(str(f)) would. Anything orjson rejects (Decimals from items read back,
+    non-str keys, ints wider than 64 bits, sets) falls back to the recursive walk,
+    which leaves every non-float value as-is.
+    """
+    try:
+        return json.loads(orjson.dumps(obj), parse_float=Decimal)
+    except orjson.JSONEncodeError:
+        return _to_dynamo_walk(obj)
+
+
+def to_attr(value):
+    """
+    Python value -> DynamoDB AttributeValue, matching what to_dynamo() + the resource
+    serializer would store: floats keep their shortest repr, NaN/inf become NULL.
+    """
+    if value is None:
+        return {"NULL": True}
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, str):
+        return {"S": value}
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            return {"NULL": True}
+        return {"N": repr(value)}
+    if isinstance(value, (int, Decimal)):
+        return {"N": str(value)}
+    if isinstance(value, dict):
+        return {"M": to_attrs(value)}
+    if isinstance(value, (list, tuple)):
+        return {"L": [to_attr(v) for v in value]}
+    raise TypeError(f"Unsupported DynamoDB value type: {type(value).__name__}")
+
+
+def to_attrs(item):
+    """Plain dict -> {name: AttributeValue} map for low-level client calls."""
+    return {key: to_attr(value) for key, value in item.items()}
+
+
+def put_job(item):
+    """Write one bestline job item (plain Python values) to the job table."""
+    get_client().put_item(TableName=os.environ["JOB_TABLE_NAME"], Item=to_attrs(item))
+
+
+def update_job(key, update_expr, expr_names, expr_values):
+    """SET-style update of one job item; key/expr_values are plain Python dicts."""
+    get_client().update_item(
+        TableName=os.environ["JOB_TABLE_NAME"],
+        Key=to_attrs(key),
+        UpdateExpression=update_expr,
+        ExpressionAttributeNames=expr_names,
+        ExpressionAttributeValues=to_attrs(expr_values),
+    )
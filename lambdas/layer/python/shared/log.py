@@ -1,7 +1,21 @@
-import json
 import logging
 import os
 
+import orjson
+
+# Deliberately process-wide, once at import: this layer owns logging in every Lambda
+# that loads it, and JsonFormatter never reads caller file/line, thread or process
+# info, so no LogRecord should collect them. These are the switches the logging
+# HOWTO documents for this ("Optimization"), _srcfile included.
+logging._srcfile = None
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.logAsyncioTasks = False  # Python 3.12+; harmless before
+
+# Optional context fields passed via `extra=`, in output order
+_EXTRA_KEYS = ("request_id", "course_id", "hole_num", "method", "path")
+
 
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON for CloudWatch Logs Insights."""
@@ -12,14 +26,16 @@ class JsonFormatter(logging.Formatter):
             "logger": record.name,
             "message": record.getMessage(),
         }
-        if hasattr(record, "request_id"):
-            entry["request_id"] = record.request_id
-        for key in ("course_id", "hole_num", "method", "path"):
-            if hasattr(record, key):
-                entry[key] = getattr(record, key)
+        fields = record.__dict__
+        for key in _EXTRA_KEYS:
+            if key in fields:
+                entry[key] = fields[key]
         if record.exc_info and record.exc_info[0]:
-            entry["exception"] = self.formatException(record.exc_info)
-        return json.dumps(entry, default=str)
+            # Cached on the record like logging.Formatter does, so each handler formats once
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            entry["exception"] = record.exc_text
+        return orjson.dumps(entry, default=str).decode()
 
 
 _configured = False
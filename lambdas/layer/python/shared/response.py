@@ -1,16 +1,15 @@
-import json
 from decimal import Decimal
 
+import orjson
 
-class DecimalEncoder(json.JSONEncoder):
-    """Handle DynamoDB Decimal types in JSON serialization."""
 
-    def default(self, obj):
-        if isinstance(obj, Decimal):
-            if obj % 1 == 0:
-                return int(obj)
-            return float(obj)
-        return super().default(obj)
+def _decimal_default(obj):
+    """Handle DynamoDB Decimal types in JSON serialization."""
+    if isinstance(obj, Decimal):
+        if obj % 1 == 0:
+            return int(obj)
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 CORS_HEADERS = {
@@ -19,17 +18,21 @@ CORS_HEADERS = {
 }
 
 
+def _response(status_code, body):
+    # Every response shares the one CORS_HEADERS dict; only status and body vary
+    return {"statusCode": status_code, "headers": CORS_HEADERS, "body": body}
+
+
 def success(body, status_code=200):
-    return {
-        "statusCode": status_code,
-        "headers": CORS_HEADERS,
-        "body": json.dumps(body, cls=DecimalEncoder),
-    }
+    return _response(status_code, orjson.dumps(body, default=_decimal_default).decode())
+
+
+def raw_success(body, status_code=200):
+    """Return an already-serialized JSON body (bytes or str) without re-encoding it."""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    return _response(status_code, body)
 
 
 def error(message, status_code=400):
-    return {
-        "statusCode": status_code,
-        "headers": CORS_HEADERS,
-        "body": json.dumps({"error": message}),
-    }
+    return _response(status_code, orjson.dumps({"error": message}).decode())
@@ -1,18 +1,29 @@
 import os
 
-import boto3
-
+from shared.aws import get_session
 from shared.log import get_logger
 
 logger = get_logger(__name__)
 
+# One pooled, keep-alive connection set per container, sized for concurrent GETs
+# (botocore Config kwargs; the Config itself is built with the client)
+S3_CONFIG = {
+    "max_pool_connections": 32,
+    "tcp_keepalive": True,
+    "connect_timeout": 2,
+    "read_timeout": 10,
+    "retries": {"mode": "standard"},
+}
+
 _client = None
 
 
 def get_client():
     global _client
     if _client is None:
-        _client = boto3.client("s3")
+        from botocore.config import Config
+
+        _client = get_session().client("s3", config=Config(**S3_CONFIG))
     return _client
 
 